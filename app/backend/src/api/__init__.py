@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 from src.api.health import router as health_router
+from src.api.metrics import router as metrics_router
 
 router = APIRouter()
 router.include_router(health_router)
+router.include_router(metrics_router)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from typing import Dict
+from src.core.database import engine, async_engine, get_pool_stats
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -7,3 +8,13 @@ router = APIRouter(prefix="/health", tags=["Health"])
 @router.get("/")
 async def health_check() -> Dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/cache")
+async def cache_stats(request: Request) -> Dict[str, int]:
+    return request.app.state.recommendation_service.query_cache.stats()
+
+
+@router.get("/db")
+async def db_pool_stats() -> Dict[str, Dict[str, int]]:
+    return {"sync": get_pool_stats(engine.pool), "async": get_pool_stats(async_engine.pool)}
@@ -1,14 +1,23 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from io import BytesIO
 from src.services.recommendation import RecommendationService
 from src.services.pdf_processor import PdfProcessorService
-from src.schemas.recommendation import RecommendationRequest, RecommendationResponse, PaperResponse
-from src.core.database import get_db
+from src.schemas.recommendation import (
+    RecommendationRequest,
+    RecommendationResponse,
+    PaperResponse,
+    BatchRecommendationRequest,
+    BatchRecommendationResponse
+)
+from src.core.database import get_async_db
+from src.core.executor import BoundedExecutor, ExecutorSaturatedError
 from src.config.settings import MAX_FILE_SIZE_BYTES
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
+SERVICE_UNAVAILABLE_DETAIL = "Server is busy. Please try again later."
+
 
 def get_recommendation_service(request: Request) -> RecommendationService:
     return request.app.state.recommendation_service
@@ -18,22 +27,65 @@ def get_pdf_processor_service(request: Request) -> PdfProcessorService:
     return request.app.state.pdf_processor_service
 
 
+def get_inference_executor(request: Request) -> BoundedExecutor:
+    return request.app.state.inference_executor
+
+
+def get_pdf_executor(request: Request) -> BoundedExecutor:
+    return request.app.state.pdf_executor
+
+
 @router.post("", response_model=RecommendationResponse)
 async def recommend_from_text(
     request: RecommendationRequest,
-    db: Session = Depends(get_db),
-    recommendation_service: RecommendationService = Depends(get_recommendation_service)
+    db: AsyncSession = Depends(get_async_db),
+    recommendation_service: RecommendationService = Depends(get_recommendation_service),
+    inference_executor: BoundedExecutor = Depends(get_inference_executor)
 ) -> RecommendationResponse:
     try:
-        recommended_papers = recommendation_service.recommend(
-            db,
+        # Inference runs in the executor, while papers are loaded without holding a thread
+        search_result = await inference_executor.run(
+            recommendation_service.search,
             request.title,
             request.abstract,
             request.numRecommendations
         )
+        recommended_papers = (await recommendation_service.hydrate_async(db, [search_result]))[0]
         return RecommendationResponse(
             papers=[PaperResponse(**paper) for paper in recommended_papers]
         )
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_UNAVAILABLE_DETAIL)
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/batch", response_model=BatchRecommendationResponse)
+async def recommend_from_text_batch(
+    request: BatchRecommendationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    recommendation_service: RecommendationService = Depends(get_recommendation_service),
+    inference_executor: BoundedExecutor = Depends(get_inference_executor)
+) -> BatchRecommendationResponse:
+    try:
+        search_results = await inference_executor.run(
+            recommendation_service.search_many,
+            [query.title for query in request.requests],
+            [query.abstract for query in request.requests],
+            [query.numRecommendations for query in request.requests]
+        )
+        recommended_papers_per_request = await recommendation_service.hydrate_async(
+            db,
+            search_results
+        )
+        return BatchRecommendationResponse(
+            results=[
+                RecommendationResponse(papers=[PaperResponse(**paper) for paper in papers])
+                for papers in recommended_papers_per_request
+            ]
+        )
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_UNAVAILABLE_DETAIL)
     except Exception:
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
@@ -42,9 +94,11 @@ async def recommend_from_text(
 async def recommend_from_pdf(
     file: UploadFile = File(...),
     numRecommendations: int = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     pdf_processor_service: PdfProcessorService = Depends(get_pdf_processor_service),
-    recommendation_service: RecommendationService = Depends(get_recommendation_service)
+    recommendation_service: RecommendationService = Depends(get_recommendation_service),
+    pdf_executor: BoundedExecutor = Depends(get_pdf_executor),
+    inference_executor: BoundedExecutor = Depends(get_inference_executor)
 ) -> RecommendationResponse:
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=422, detail="Invalid file type. Please upload a PDF file.")
@@ -56,12 +110,19 @@ async def recommend_from_pdf(
         )
 
     file_content = BytesIO(await file.read())
-    title, abstract = pdf_processor_service.extract_title_and_abstract(file_content)
+    try:
+        title, abstract = await pdf_executor.run(
+            pdf_processor_service.extract_title_and_abstract,
+            file_content
+        )
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_UNAVAILABLE_DETAIL)
+
     if not title and not abstract:
         raise HTTPException(status_code=422, detail="Failed to parse a title and abstract.")
 
     try:
-        RecommendationRequest(
+        request = RecommendationRequest(
             title=title,
             abstract=abstract,
             numRecommendations=numRecommendations
@@ -70,14 +131,18 @@ async def recommend_from_pdf(
         raise HTTPException(status_code=422, detail=f"Validation Error: {e}")
 
     try:
-        recommended_papers = recommendation_service.recommend(
-            db,
-            title,
-            abstract,
-            numRecommendations
+        # Inference runs in the executor, while papers are loaded without holding a thread
+        search_result = await inference_executor.run(
+            recommendation_service.search,
+            request.title,
+            request.abstract,
+            request.numRecommendations
         )
+        recommended_papers = (await recommendation_service.hydrate_async(db, [search_result]))[0]
         return RecommendationResponse(
             papers=[PaperResponse(**paper) for paper in recommended_papers]
         )
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_UNAVAILABLE_DETAIL)
     except Exception:
         raise HTTPException(status_code=500, detail="Internal Server Error")
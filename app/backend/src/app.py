@@ -1,24 +1,83 @@
 import os
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 from src.api import router as api_router
 from src.api.v1.routes import router as api_v1_router
+from src.core.metrics import REQUEST_SECONDS, stage_timings, format_server_timing
+from src.config.settings import SERVER_TIMING_ENABLED
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     from src.services.factory import create_recommendation_service
     from src.services.pdf_processor import PdfProcessorService
+    from src.core.executor import BoundedExecutor
+    from src.config.settings import (
+        INFERENCE_MAX_WORKERS,
+        INFERENCE_MAX_PENDING,
+        PDF_MAX_WORKERS,
+        PDF_MAX_PENDING
+    )
+    from src.utils.memory_utils import get_memory_usage_mb
+    from src.core.database import async_engine
 
+    start = time.perf_counter()
     app.state.recommendation_service = create_recommendation_service()
     app.state.pdf_processor_service = PdfProcessorService()
+
+    resident_mb, shared_mb = get_memory_usage_mb()
+    print(
+        f"Worker {os.getpid()} loaded services in {time.perf_counter() - start:.2f}s " +
+        f"(RSS: {resident_mb:.1f} MB, shared: {shared_mb:.1f} MB)"
+    )
+    app.state.inference_executor = BoundedExecutor(
+        "inference",
+        INFERENCE_MAX_WORKERS,
+        INFERENCE_MAX_PENDING
+    )
+    app.state.pdf_executor = BoundedExecutor("pdf", PDF_MAX_WORKERS, PDF_MAX_PENDING)
     yield
+    app.state.inference_executor.shutdown()
+    app.state.pdf_executor.shutdown()
+    app.state.recommendation_service.close()
+    await async_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
 
+
+@app.middleware("http")
+async def record_request_metrics(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # Stages running in this request's context, including executor threads, add their timings
+    timings = {}
+    token = stage_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        stage_timings.reset(token)
+    elapsed = time.perf_counter() - start
+
+    # Label by endpoint name rather than path to keep label values bounded
+    route = request.scope.get("route")
+    REQUEST_SECONDS.labels(
+        method=request.method,
+        route=route.name if route else "unmatched",
+        status=response.status_code
+    ).observe(elapsed)
+
+    if SERVER_TIMING_ENABLED:
+        timings["total"] = elapsed
+        response.headers["Server-Timing"] = format_server_timing(timings)
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[os.getenv("FRONTEND_URL")],
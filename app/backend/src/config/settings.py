@@ -3,20 +3,67 @@ NUM_RECOMMENDATIONS_MIN = 1
 NUM_RECOMMENDATIONS_MAX = 50
 MAX_TEXT_LENGTH = 1500
 MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024
+MAX_BATCH_REQUESTS = 100
+
+# Database constants, pool settings apply to server databases such as PostgreSQL
+DB_POOL_SIZE = 10
+DB_MAX_OVERFLOW = 10
+DB_POOL_TIMEOUT_SECONDS = 30
+DB_POOL_RECYCLE_SECONDS = 30 * 60
+SQLITE_CACHE_SIZE_KB = 64 * 1024
+SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+# Index loading constants
+FAISS_MMAP = True
 
 # Embedding service constants
 TEXT_EMBEDDING_MODEL_DIR = "data/models/specter2/"
 BERT_MAX_TOKENS = 512
+# Token pooling, "mean" or "cls", must match the research pipeline that built the indexes
+TEXT_POOLING = "mean"
+
+# Text encoder backend, "torch" or "onnx" (exported with src.utils.export_onnx)
+TEXT_ENCODER_BACKEND = "torch"
+TEXT_ONNX_MODEL_PATH = "data/models/specter2/model.onnx"
 
 TEXT_INDEX_PATH = "data/embeddings/v10_train_specter2.faiss"
-TEXT_IDS_PATH = "data/embeddings/v10_train_specter2_ids.pkl"
+TEXT_IDS_PATH = "data/embeddings/v10_train_specter2_ids.npy"
 
 NODE_INDEX_PATH = "data/embeddings/v10_train_node2vec_4_2.faiss"
-NODE_IDS_PATH = "data/embeddings/v10_train_node2vec_4_2_ids.pkl"
+NODE_IDS_PATH = "data/embeddings/v10_train_node2vec_4_2_ids.npy"
 NUM_NODE_NEIGHBOURS = 5
+NODE_CENTROID_CACHE_SIZE = 10000
 
 FUSION_MODEL_PATH = "data/models/dcca/v10_dcca_specter2_node2vec_4_2.pkl"
+FUSION_WEIGHTS_PATH = "data/models/dcca/v10_dcca_specter2_node2vec_4_2.npz"
 
 # Index search service constants
 FUSED_INDEX_PATH = "data/embeddings/v10_train_dcca_concat_specter2_node2vec_4_2.faiss"
-FUSED_IDS_PATH = "data/embeddings/v10_train_dcca_concat_specter2_node2vec_4_2_ids.pkl"
+FUSED_IDS_PATH = "data/embeddings/v10_train_dcca_concat_specter2_node2vec_4_2_ids.npy"
+
+# Paper metadata store in fused index row order, built with src.utils.build_paper_store.
+# Papers are loaded from the database when unset
+PAPER_STORE_PATH = None
+
+# Search parameters for approximate (IVF or HNSW) fused indexes, ignored for flat indexes
+FAISS_NPROBE = 64
+FAISS_EF_SEARCH = 128
+
+# Embedding batcher constants
+EMBEDDING_MAX_BATCH_SIZE = 16
+EMBEDDING_MAX_BATCH_WAIT_MS = 5
+
+# Executor constants. Inference threads mostly wait on the embedding batcher, so there are
+# enough of them to fill one batch while the previous batch is being searched
+INFERENCE_MAX_WORKERS = 2 * EMBEDDING_MAX_BATCH_SIZE
+INFERENCE_MAX_PENDING = 4 * INFERENCE_MAX_WORKERS
+PDF_MAX_WORKERS = 2
+PDF_MAX_PENDING = 8
+
+# Metrics constants, Server-Timing headers expose per-stage latencies to clients
+SERVER_TIMING_ENABLED = False
+
+# Query cache constants, set QUERY_CACHE_PATH to share the cache between workers
+QUERY_CACHE_SIZE = 10000
+QUERY_CACHE_TTL_SECONDS = 24 * 60 * 60
+QUERY_CACHE_PATH = None
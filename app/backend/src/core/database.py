@@ -1,14 +1,118 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import Pool, QueuePool
+from typing import Any, AsyncGenerator, Dict, Generator
+from src.core.metrics import DB_POOL_CAPACITY, DB_POOL_CHECKED_OUT
+from src.config.settings import (
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE_BYTES
+)
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def get_engine_options(database_url: str) -> Dict[str, Any]:
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True
+    }
+
+
+def configure_sqlite(engine: Engine, read_only: bool) -> None:
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection: Any, _: Any) -> None:
+        # WAL lets readers proceed while the database is being written to
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_BYTES}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def create_db_engine(database_url: str) -> Engine:
+    engine = create_engine(database_url, **get_engine_options(database_url))
+    configure_sqlite(engine, read_only=False)
+    return engine
+
+
+def create_async_db_engine(database_url: str) -> AsyncEngine:
+    # The serving path only reads papers, so SQLite connections are made read-only
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+    async_engine = create_async_engine(url, **get_engine_options(database_url))
+    configure_sqlite(async_engine.sync_engine, read_only=True)
+    return async_engine
+
+
+def get_pool_stats(pool: Pool) -> Dict[str, int]:
+    if not isinstance(pool, QueuePool):
+        return {}
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow()
+    }
+
+
+def record_pool_metrics(engine: Engine, name: str) -> None:
+    # Pool stats are tracked from checkout events, so every worker reports its own pool
+    if not isinstance(engine.pool, QueuePool):
+        return
+
+    DB_POOL_CAPACITY.labels(engine=name).set(engine.pool.size())
+    checked_out = DB_POOL_CHECKED_OUT.labels(engine=name)
+
+    @event.listens_for(engine, "checkout")
+    def record_checkout(*_: Any) -> None:
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def record_checkin(*_: Any) -> None:
+        checked_out.dec()
+
 
 load_dotenv()
-engine = create_engine(os.getenv("DATABASE_URL"), connect_args={"check_same_thread": False})
+engine = create_db_engine(os.getenv("DATABASE_URL"))
+record_pool_metrics(engine, "sync")
 SessionLocal = sessionmaker(bind=engine)
 
+async_engine = create_async_db_engine(os.getenv("DATABASE_URL"))
+record_pool_metrics(async_engine.sync_engine, "async")
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     with SessionLocal() as db:
         yield db
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,48 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(Exception):
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.num_pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.num_pending >= self.max_pending:
+                raise ExecutorSaturatedError(
+                    f"{self.name} executor is saturated ({self.num_pending} pending tasks)"
+                )
+            self.num_pending += 1
+
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, func, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        # Released when the work finishes rather than when the caller stops waiting, so a
+        # cancelled request (e.g. a client disconnect) still counts until its thread is free
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Optional[Future] = None) -> None:
+        with self._lock:
+            self.num_pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,81 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import generate_latest, multiprocess
+from typing import Dict, Generator, Optional
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds.",
+    ("method", "route", "status"),
+    buckets=DEFAULT_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    "recommendation_stage_duration_seconds",
+    "Latency of each recommendation pipeline stage in seconds.",
+    ("stage",),
+    buckets=DEFAULT_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "recommendation_stage_errors",
+    "Exceptions raised by each recommendation pipeline stage.",
+    ("stage",)
+)
+QUERY_CACHE_REQUESTS = Counter(
+    "query_cache_requests",
+    "Query cache lookups by result, hit or miss.",
+    ("result",)
+)
+# Gauges of live workers are summed when metrics are aggregated across processes
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_size_connections",
+    "Connections kept open by each database connection pool.",
+    ("engine",),
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections checked out of each database connection pool.",
+    ("engine",),
+    multiprocess_mode="livesum"
+)
+
+
+def render_metrics() -> bytes:
+    # With several uvicorn workers, each writes its metrics to PROMETHEUS_MULTIPROC_DIR
+    # and the worker serving the scrape aggregates them
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+# Per-request stage durations, set by the Server-Timing middleware
+stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+
+@contextmanager
+def time_stage(stage: str) -> Generator[None, None, None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage=stage).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(stage=stage).observe(elapsed)
+
+        timings = stage_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in timings.items())
@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session, subqueryload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, subqueryload, selectinload
 from uuid import UUID
 from typing import List
 from src.models.paper import Paper
@@ -10,3 +12,14 @@ def get_papers_by_ids(db: Session, ids: List[UUID]) -> List[Paper]:
             subqueryload(Paper.venue),
             subqueryload(Paper.authors)
         ).all()
+
+
+async def get_papers_by_ids_async(db: AsyncSession, ids: List[UUID]) -> List[Paper]:
+    # Relationships must be loaded eagerly as lazy loading is unavailable in async sessions
+    result = await db.execute(
+        select(Paper).where(Paper.id.in_(ids)).options(
+            selectinload(Paper.venue),
+            selectinload(Paper.authors)
+        )
+    )
+    return list(result.scalars().all())
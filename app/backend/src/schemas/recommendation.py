@@ -1,6 +1,11 @@
 from pydantic import BaseModel, model_validator
 from typing import List
-from src.config.settings import MAX_TEXT_LENGTH, NUM_RECOMMENDATIONS_MIN, NUM_RECOMMENDATIONS_MAX
+from src.config.settings import (
+    MAX_TEXT_LENGTH,
+    NUM_RECOMMENDATIONS_MIN,
+    NUM_RECOMMENDATIONS_MAX,
+    MAX_BATCH_REQUESTS
+)
 
 
 class RecommendationRequest(BaseModel):
@@ -10,6 +15,10 @@ class RecommendationRequest(BaseModel):
 
     @model_validator(mode="before")
     def validate_combined_length_and_num_recommendations(cls, values):
+        # Non-object input is left to field validation, which rejects it
+        if not isinstance(values, dict):
+            return values
+
         title = values.get("title")
         abstract = values.get("abstract")
 
@@ -37,6 +46,17 @@ class RecommendationRequest(BaseModel):
         return values
 
 
+class BatchRecommendationRequest(BaseModel):
+    requests: List[RecommendationRequest]
+
+    @model_validator(mode="after")
+    def validate_num_requests(self):
+        # Runs after field validation, so requests is known to be a list
+        if not self.requests or len(self.requests) > MAX_BATCH_REQUESTS:
+            raise ValueError(f"requests must contain between 1 and {MAX_BATCH_REQUESTS} items")
+        return self
+
+
 class AuthorResponse(BaseModel):
     first_name: str
     last_name: str
@@ -54,3 +74,7 @@ class PaperResponse(BaseModel):
 
 class RecommendationResponse(BaseModel):
     papers: List[PaperResponse]
+
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[RecommendationResponse]
@@ -1,93 +1,96 @@
-import torch
+import faiss
 import numpy as np
-import warnings
-from transformers import AutoModel, AutoTokenizer
-from mvlearn.embed import DCCA
+from functools import lru_cache
 from typing import List, Tuple
-from src.utils.file_utils import read_embeddings, read_obj
+from src.core.metrics import time_stage
+from src.services.projection import DccaProjector
+from src.services.text_encoder import TextEncoder
+from src.utils.file_utils import read_embeddings
+from src.utils.id_table import IdTable, read_ids
+
+
+def get_query_texts(titles: List[str], abstracts: List[str]) -> List[str]:
+    return [f"{title} {abstract}" for title, abstract in zip(titles, abstracts)]
 
 
 class EmbeddingService:
     def __init__(
         self,
-        text_model_dir: str,
-        tokenizer_max_len: int,
+        text_encoder: TextEncoder,
         text_index_path: str,
         text_ids_path: str,
         node_index_path: str,
         node_ids_path: str,
         num_node_neighbours: int,
-        fusion_model_path: str
+        fusion_weights_path: str,
+        node_centroid_cache_size: int,
+        mmap: bool = False
     ):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.text_model = self._load_text_model(text_model_dir)
-        self.tokenizer = AutoTokenizer.from_pretrained(text_model_dir)
-        self.tokenizer_max_len = tokenizer_max_len
-
-        self.text_index = read_embeddings(text_index_path)
-        self.text_ids: List[str] = read_obj(text_ids_path)
-        self.node_index = read_embeddings(node_index_path)
-        self.node_ids: List[str] = read_obj(node_ids_path)
+        self.text_encoder = text_encoder
+        self.text_index = read_embeddings(text_index_path, mmap)
+        self.node_embeddings = self._load_node_embeddings(
+            read_ids(text_ids_path),
+            read_embeddings(node_index_path, mmap),
+            read_ids(node_ids_path)
+        )
         self.num_node_neighbours = num_node_neighbours
-        self.node_id_to_idx = {id: idx for idx, id in enumerate(self.node_ids)}
-        self.fusion_model: DCCA = read_obj(fusion_model_path)
+        self._node_centroid = lru_cache(maxsize=node_centroid_cache_size)(
+            self._compute_node_centroid
+        )
+        self.fusion_projector = DccaProjector(fusion_weights_path)
 
-    def _load_text_model(self, text_model_dir: str) -> AutoModel:
-        model = AutoModel.from_pretrained(text_model_dir, torch_dtype=torch.float32)
-        model = model.to(self.device)
-        model.eval()
-        return model
+    def _load_node_embeddings(
+        self,
+        text_ids: IdTable,
+        node_index: faiss.Index,
+        node_ids: IdTable
+    ) -> np.ndarray:
+        # Row i holds the node embedding of the paper at row i of the text index
+        order = node_ids.align(text_ids)
+        node_embeddings = node_index.reconstruct_n(0, node_index.ntotal)
+        return np.ascontiguousarray(node_embeddings[order])
 
     def embed(self, title: str, abstract: str) -> np.ndarray:
-        text_embedding = self._embed_text(title, abstract)
-        node_embedding = self._embed_node(text_embedding)
-        text_projection, node_projection = self._project_embeddings(text_embedding, node_embedding)
-        return self._concat_embeddings(text_projection, node_projection)
+        return self.embed_batch([title], [abstract])
 
-    def _embed_text(self, title: str, abstract: str) -> np.ndarray:
-        text = f"{title} {abstract}"
-        inputs = self.tokenizer(
-            text,
-            max_length=self.tokenizer_max_len,
-            truncation=True,
-            return_tensors="pt"
-        ).to(self.device)
+    def embed_batch(self, titles: List[str], abstracts: List[str]) -> np.ndarray:
+        return self.fuse(self.embed_text(titles, abstracts))
 
-        with torch.no_grad():
-            outputs = self.text_model(**inputs)
+    def embed_text(self, titles: List[str], abstracts: List[str]) -> np.ndarray:
+        return self.text_encoder.encode(get_query_texts(titles, abstracts))
 
-        last_hidden_state = outputs.last_hidden_state
-        embedding = last_hidden_state.mean(dim=1).cpu().numpy()
-        return embedding
-
-    def _embed_node(self, query_text_embedding: np.ndarray) -> np.ndarray:
-        _, indices = self.text_index.search(
-            query_text_embedding,
-            self.num_node_neighbours
+    def fuse(self, text_embeddings: np.ndarray) -> np.ndarray:
+        node_embeddings = self._embed_node(text_embeddings)
+        text_projections, node_projections = self._project_embeddings(
+            text_embeddings,
+            node_embeddings
         )
-        neighbour_text_ids = [self.text_ids[i] for i in indices[0]]
+        return self._concat_embeddings(text_projections, node_projections)
+
+    def _embed_node(self, query_text_embeddings: np.ndarray) -> np.ndarray:
+        with time_stage("neighbour_search"):
+            _, indices = self.text_index.search(
+                query_text_embeddings,
+                self.num_node_neighbours
+            )
 
-        neighbour_node_embeddings = []
-        for neighbour_text_id in neighbour_text_ids:
-            node_idx = self.node_id_to_idx[neighbour_text_id]
-            neighbour_node_embeddings.append(self.node_index.reconstruct(node_idx))
+        with time_stage("node_centroid"):
+            return np.vstack([
+                self._node_centroid(tuple(sorted(neighbour_indices.tolist())))
+                for neighbour_indices in indices
+            ])
 
-        return np.expand_dims(np.mean(neighbour_node_embeddings, axis=0), axis=0)
+    def _compute_node_centroid(self, neighbour_indices: Tuple[int, ...]) -> np.ndarray:
+        # Average the node embeddings of the nearest text neighbours
+        return self.node_embeddings[list(neighbour_indices)].mean(axis=0)
 
     def _project_embeddings(
         self,
-        text_embedding: np.ndarray,
-        node_embedding: np.ndarray
+        text_embeddings: np.ndarray,
+        node_embeddings: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=UserWarning, message=".*torch.symeig.*")
-            projections = self.fusion_model.transform([
-                np.vstack([text_embedding, text_embedding]),
-                np.vstack([node_embedding, node_embedding])
-            ])
-
-        text_projection, node_projection = projections[0][0], projections[1][0]
-        return np.expand_dims(text_projection, axis=0), np.expand_dims(node_projection, axis=0)
+        with time_stage("projection"):
+            return self.fusion_projector.project(text_embeddings, node_embeddings)
 
     def _concat_embeddings(
         self,
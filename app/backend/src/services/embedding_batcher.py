@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+from src.services.embedding import EmbeddingService
+
+PendingQuery = Tuple[str, str, Future]
+
+
+class EmbeddingBatcher:
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        max_batch_size: int,
+        max_wait_ms: float
+    ):
+        self.embedding_service = embedding_service
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self._queue: "queue.Queue[Optional[PendingQuery]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def embed(self, title: str, abstract: str) -> np.ndarray:
+        if self.max_batch_size <= 1:
+            return self.embedding_service.embed(title, abstract)
+
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((title, abstract, future))
+        return future.result()
+
+    def close(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                return
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="embedding-batcher",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            pending = self._queue.get()
+            if pending is None:
+                return
+
+            batch = [pending]
+            deadline = time.monotonic() + self.max_wait_seconds
+            stop = False
+
+            # Collect further queries until the batch is full or the wait window closes
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stop = True
+                    break
+                batch.append(pending)
+
+            self._process_batch(batch)
+            if stop:
+                return
+
+    def _process_batch(self, batch: List[PendingQuery]) -> None:
+        titles = [title for title, _, _ in batch]
+        abstracts = [abstract for _, abstract, _ in batch]
+        futures = [future for _, _, future in batch]
+
+        try:
+            embeddings = self.embedding_service.embed_batch(titles, abstracts)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        for i, future in enumerate(futures):
+            future.set_result(embeddings[i:i + 1])
@@ -1,30 +1,101 @@
 from src.services.embedding import EmbeddingService
+from src.services.text_encoder import create_text_encoder
+from src.services.embedding_batcher import EmbeddingBatcher
 from src.services.index_search import IndexSearchService
 from src.services.recommendation import RecommendationService
+from src.services.query_cache import create_query_cache
+from src.services.paper_store import PaperStore
 from src.config.settings import (
     TEXT_EMBEDDING_MODEL_DIR,
     BERT_MAX_TOKENS,
+    TEXT_POOLING,
+    TEXT_ENCODER_BACKEND,
+    TEXT_ONNX_MODEL_PATH,
     TEXT_INDEX_PATH,
     TEXT_IDS_PATH,
     NODE_INDEX_PATH,
     NODE_IDS_PATH,
     NUM_NODE_NEIGHBOURS,
-    FUSION_MODEL_PATH,
+    NODE_CENTROID_CACHE_SIZE,
+    FUSION_WEIGHTS_PATH,
     FUSED_INDEX_PATH,
-    FUSED_IDS_PATH
+    FUSED_IDS_PATH,
+    PAPER_STORE_PATH,
+    FAISS_NPROBE,
+    FAISS_EF_SEARCH,
+    FAISS_MMAP,
+    EMBEDDING_MAX_BATCH_SIZE,
+    EMBEDDING_MAX_BATCH_WAIT_MS,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL_SECONDS,
+    QUERY_CACHE_PATH,
+    NUM_RECOMMENDATIONS_MAX
 )
 
 
+def check_paper_store(paper_store: PaperStore, search_service: IndexSearchService) -> None:
+    # Rows are read from the store by index position, so both must come from the same build
+    num_rows = {len(paper_store), len(search_service.ids), search_service.index.ntotal}
+    if len(num_rows) > 1:
+        raise ValueError(
+            f"Paper store has {len(paper_store)} rows, but the fused index has " +
+            f"{search_service.index.ntotal} rows and {len(search_service.ids)} IDs. " +
+            "Rebuild the paper store with src.utils.build_paper_store."
+        )
+
+
 def create_recommendation_service() -> RecommendationService:
-    embedding_service = EmbeddingService(
+    text_encoder = create_text_encoder(
+        TEXT_ENCODER_BACKEND,
         TEXT_EMBEDDING_MODEL_DIR,
         BERT_MAX_TOKENS,
+        TEXT_POOLING,
+        TEXT_ONNX_MODEL_PATH
+    )
+    embedding_service = EmbeddingService(
+        text_encoder,
         TEXT_INDEX_PATH,
         TEXT_IDS_PATH,
         NODE_INDEX_PATH,
         NODE_IDS_PATH,
         NUM_NODE_NEIGHBOURS,
-        FUSION_MODEL_PATH
+        FUSION_WEIGHTS_PATH,
+        NODE_CENTROID_CACHE_SIZE,
+        FAISS_MMAP
+    )
+    search_service = IndexSearchService(
+        FUSED_INDEX_PATH,
+        FUSED_IDS_PATH,
+        FAISS_NPROBE,
+        FAISS_EF_SEARCH,
+        FAISS_MMAP
+    )
+    embedding_batcher = EmbeddingBatcher(
+        embedding_service,
+        EMBEDDING_MAX_BATCH_SIZE,
+        EMBEDDING_MAX_BATCH_WAIT_MS
+    )
+    # A shared cache outlives restarts, so entries from a rebuilt index or model are not reused
+    cache_version = "\n".join([
+        search_service.ids.get_hash(),
+        TEXT_EMBEDDING_MODEL_DIR,
+        TEXT_POOLING,
+        FUSION_WEIGHTS_PATH
+    ])
+    query_cache = create_query_cache(
+        QUERY_CACHE_SIZE,
+        QUERY_CACHE_TTL_SECONDS,
+        QUERY_CACHE_PATH,
+        cache_version
+    )
+    paper_store = PaperStore(PAPER_STORE_PATH) if PAPER_STORE_PATH else None
+    if paper_store is not None:
+        check_paper_store(paper_store, search_service)
+    return RecommendationService(
+        embedding_service,
+        search_service,
+        embedding_batcher,
+        query_cache,
+        NUM_RECOMMENDATIONS_MAX,
+        paper_store
     )
-    search_service = IndexSearchService(FUSED_INDEX_PATH, FUSED_IDS_PATH)
-    return RecommendationService(embedding_service, search_service)
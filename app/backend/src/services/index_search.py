@@ -1,19 +1,54 @@
 import numpy as np
 import faiss
+from uuid import UUID
 from typing import List, Tuple
-from src.utils.file_utils import read_embeddings, read_obj
+from src.core.metrics import time_stage
+from src.utils.file_utils import read_embeddings
+from src.utils.id_table import read_ids
 
 
 class IndexSearchService:
-    def __init__(self, index_path: str, ids_path: str):
-        self.index = read_embeddings(index_path)
-        self.ids: List[str] = read_obj(ids_path)
+    def __init__(
+        self,
+        index_path: str,
+        ids_path: str,
+        nprobe: int,
+        ef_search: int,
+        mmap: bool = False
+    ):
+        self.index = read_embeddings(index_path, mmap)
+        self.ids = read_ids(ids_path, mmap)
+        self._set_search_parameters(nprobe, ef_search)
 
-    def search(self, query_embedding: np.ndarray, top_k: int) -> Tuple[List[str], List[float]]:
-        query_embedding = query_embedding.astype(np.float32)
-        faiss.normalize_L2(query_embedding)
+    def _set_search_parameters(self, nprobe: int, ef_search: int) -> None:
+        parameter_space = faiss.ParameterSpace()
 
-        distances, indices = self.index.search(query_embedding, top_k)
-        ids = [self.ids[idx] for idx in indices[0]]
-        scores = [dist for dist in distances[0]]
-        return ids, scores
+        if faiss.try_extract_index_ivf(self.index) is not None:
+            parameter_space.set_index_parameter(self.index, "nprobe", nprobe)
+        elif isinstance(faiss.downcast_index(self.index), faiss.IndexHNSW):
+            parameter_space.set_index_parameter(self.index, "efSearch", ef_search)
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int
+    ) -> Tuple[List[UUID], List[float], List[int]]:
+        ids, scores, rows = self.search_batch(query_embedding, top_k)
+        return ids[0], scores[0], rows[0]
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int
+    ) -> Tuple[List[List[UUID]], List[List[float]], List[List[int]]]:
+        query_embeddings = query_embeddings.astype(np.float32)
+        faiss.normalize_L2(query_embeddings)
+
+        # Approximate indexes pad results with -1 when fewer than top_k neighbours are found
+        with time_stage("index_search"):
+            distances, indices = self.index.search(query_embeddings, top_k)
+        # Index rows are kept alongside the IDs, as they are also the paper store rows
+        rows = [row[row >= 0].tolist() for row in indices]
+        ids = [self.ids.get_uuids(query_rows) for query_rows in rows]
+        scores = [dists[row >= 0].tolist() for row, dists in zip(indices, distances)]
+        return ids, scores, rows
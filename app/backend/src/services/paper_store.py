@@ -0,0 +1,56 @@
+import json
+import os
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional
+from src.models.paper import Paper
+
+
+def serialize_paper(paper: Paper) -> Dict[str, Any]:
+    return {
+        "id": str(paper.id),
+        "title": paper.title,
+        "year": paper.year,
+        "abstract": paper.abstract,
+        "venue": paper.venue.name,
+        "authors": [
+            {"first_name": author.first_name, "last_name": author.last_name}
+            for author in paper.authors
+        ]
+    }
+
+
+def write_paper_store(store_path: str, records: Iterable[Optional[Dict[str, Any]]]) -> None:
+    # Records are stored as JSON blobs back to back, with an empty blob for missing papers
+    offsets = [0]
+    os.makedirs(os.path.dirname(store_path) or ".", exist_ok=True)
+    with open(f"{store_path}.bin", "wb") as file:
+        for record in records:
+            if record is not None:
+                offsets.append(offsets[-1] + file.write(json.dumps(record).encode("utf-8")))
+            else:
+                offsets.append(offsets[-1])
+
+    np.save(f"{store_path}_offsets.npy", np.array(offsets, dtype=np.int64))
+    print(f"Paper store with {len(offsets) - 1} rows saved to: {store_path}")
+
+
+class PaperStore:
+    # Read-only paper metadata in the same row order as the fused index
+    def __init__(self, store_path: str):
+        self.offsets = np.load(f"{store_path}_offsets.npy", mmap_mode="r")
+        if self.offsets[-1] > 0:
+            self.data = np.memmap(f"{store_path}.bin", dtype=np.uint8, mode="r")
+        else:
+            self.data = np.empty(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_paper(self, row: int) -> Optional[Dict[str, Any]]:
+        start, end = self.offsets[row], self.offsets[row + 1]
+        if start == end:
+            return None
+        return json.loads(self.data[start:end].tobytes())
+
+    def get_papers(self, rows: List[int]) -> List[Optional[Dict[str, Any]]]:
+        return [self.get_paper(row) for row in rows]
@@ -2,9 +2,11 @@ import io
 import fitz
 import re
 from typing import Tuple
+from src.core.metrics import time_stage
 
 
 class PdfProcessorService:
+    @time_stage("pdf_extract")
     def extract_title_and_abstract(self, file_content: io.BytesIO) -> Tuple[str, str]:
         doc = fitz.open(stream=file_content, filetype="pdf")
         first_page = doc[0]
@@ -0,0 +1,20 @@
+import numpy as np
+
+MEAN_POOLING = "mean"
+CLS_POOLING = "cls"
+
+
+def pool(last_hidden_state: np.ndarray, attention_mask: np.ndarray, strategy: str) -> np.ndarray:
+    # Must match research/src/models/text/pooling.py so queries land near the indexed papers
+    if strategy == MEAN_POOLING:
+        return masked_mean(last_hidden_state, attention_mask)
+    if strategy == CLS_POOLING:
+        return last_hidden_state[:, 0]
+    raise ValueError(f"Unknown pooling strategy: {strategy}")
+
+
+def masked_mean(last_hidden_state: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    # Average token embeddings, ignoring the padding added to shorter texts in the batch
+    mask = attention_mask[..., np.newaxis].astype(last_hidden_state.dtype)
+    summed = (last_hidden_state * mask).sum(axis=1)
+    return summed / np.clip(mask.sum(axis=1), 1, None)
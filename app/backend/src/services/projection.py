@@ -0,0 +1,61 @@
+import numpy as np
+from typing import List, Tuple
+
+Layer = Tuple[np.ndarray, np.ndarray]
+
+VIEWS = ("text", "node")
+
+
+class DccaProjector:
+    def __init__(self, weights_path: str):
+        weights = np.load(weights_path)
+        self.text_layers, self.text_mean, self.text_projection = self._load_view(weights, "text")
+        self.node_layers, self.node_mean, self.node_projection = self._load_view(weights, "node")
+
+    def _load_view(
+        self,
+        weights: np.lib.npyio.NpzFile,
+        view: str
+    ) -> Tuple[List[Layer], np.ndarray, np.ndarray]:
+        num_layers = int(weights[f"{view}_num_layers"])
+        layers = [
+            (weights[f"{view}_weight_{i}"], weights[f"{view}_bias_{i}"])
+            for i in range(num_layers)
+        ]
+        return layers, weights[f"{view}_mean"], weights[f"{view}_projection"]
+
+    def project(
+        self,
+        text_embeddings: np.ndarray,
+        node_embeddings: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        text_projections = self._project_view(
+            text_embeddings,
+            self.text_layers,
+            self.text_mean,
+            self.text_projection
+        )
+        node_projections = self._project_view(
+            node_embeddings,
+            self.node_layers,
+            self.node_mean,
+            self.node_projection
+        )
+        return text_projections, node_projections
+
+    def _project_view(
+        self,
+        embeddings: np.ndarray,
+        layers: List[Layer],
+        mean: np.ndarray,
+        projection: np.ndarray
+    ) -> np.ndarray:
+        # Deep network: sigmoid between linear layers, none after the last
+        outputs = embeddings.astype(np.float64)
+        for i, (weight, bias) in enumerate(layers):
+            outputs = outputs @ weight.T + bias
+            if i < len(layers) - 1:
+                outputs = 1 / (1 + np.exp(-outputs))
+
+        # Linear CCA: centre with the training mean and project
+        return (outputs - mean) @ projection
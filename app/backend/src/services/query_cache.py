@@ -0,0 +1,173 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+from typing import Dict, List, Optional, Tuple
+from src.core.metrics import QUERY_CACHE_REQUESTS
+
+
+@dataclass
+class CachedQuery:
+    embedding: np.ndarray
+    ids: List[UUID]
+    scores: List[float]
+    rows: List[int]
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedQuery]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: CachedQuery) -> None:
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedQuery]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedQuery]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedQuery) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SqliteCacheBackend(CacheBackend):
+    # Shared between uvicorn workers through a single SQLite file
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path: str, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._num_sets = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS query_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[CachedQuery]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM query_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+
+        # Entries written by other builds may no longer unpickle, so treat them as misses
+        try:
+            return pickle.loads(row[0])
+        except (pickle.UnpicklingError, AttributeError, EOFError, ImportError, TypeError):
+            return None
+
+    def set(self, key: str, value: CachedQuery) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO query_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), time.time() + self.ttl_seconds)
+            )
+
+            # Periodically drop expired entries and those beyond the size limit
+            self._num_sets += 1
+            if self._num_sets % self.EVICTION_INTERVAL == 0:
+                self._connection.execute(
+                    "DELETE FROM query_cache WHERE expires_at <= ?",
+                    (time.time(),)
+                )
+                self._connection.execute(
+                    "DELETE FROM query_cache WHERE key IN ("
+                    "SELECT key FROM query_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_size,)
+                )
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM query_cache").fetchone()[0]
+
+
+class QueryCache:
+    def __init__(self, backend: CacheBackend, version: str = ""):
+        # Cached neighbours are only valid for the index they were found in, so keys include
+        # a version of the index and model
+        self.backend = backend
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(title: str, abstract: str, version: str = "") -> str:
+        # Ignore case and whitespace differences between otherwise identical submissions
+        normalized_title = " ".join(title.lower().split())
+        normalized_abstract = " ".join(abstract.lower().split())
+        text = f"{version}\n{normalized_title}\n{normalized_abstract}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, title: str, abstract: str) -> Optional[CachedQuery]:
+        value = self.backend.get(self.make_key(title, abstract, self.version))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        QUERY_CACHE_REQUESTS.labels(result="miss" if value is None else "hit").inc()
+        return value
+
+    def set(self, title: str, abstract: str, value: CachedQuery) -> None:
+        self.backend.set(self.make_key(title, abstract, self.version), value)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": self.backend.size()}
+
+
+def create_query_cache(
+    max_size: int,
+    ttl_seconds: float,
+    path: Optional[str] = None,
+    version: str = ""
+) -> QueryCache:
+    if path:
+        return QueryCache(SqliteCacheBackend(path, max_size, ttl_seconds), version)
+    return QueryCache(MemoryCacheBackend(max_size, ttl_seconds), version)
@@ -1,19 +1,38 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from src.core.metrics import time_stage
 from src.services.embedding import EmbeddingService
+from src.services.embedding_batcher import EmbeddingBatcher
 from src.services.index_search import IndexSearchService
-from src.crud.paper import get_papers_by_ids
+from src.services.query_cache import QueryCache, CachedQuery
+from src.services.paper_store import PaperStore, serialize_paper
+from src.crud.paper import get_papers_by_ids, get_papers_by_ids_async
+from src.models.paper import Paper
+
+SearchResult = Tuple[List[UUID], List[float], List[int]]
 
 
 class RecommendationService:
     def __init__(
         self,
         embedding_service: EmbeddingService,
-        search_service: IndexSearchService
+        search_service: IndexSearchService,
+        embedding_batcher: EmbeddingBatcher,
+        query_cache: QueryCache,
+        max_top_k: int,
+        paper_store: Optional[PaperStore] = None
     ):
         self.embedding_service = embedding_service
         self.search_service = search_service
+        self.embedding_batcher = embedding_batcher
+        self.query_cache = query_cache
+        self.max_top_k = max_top_k
+        self.paper_store = paper_store
+
+    def close(self) -> None:
+        self.embedding_batcher.close()
 
     def recommend(
         self,
@@ -22,27 +41,134 @@ class RecommendationService:
         abstract: str,
         top_k: int
     ) -> List[Dict[str, Any]]:
-        query_embedding = self.embedding_service.embed(title, abstract)
-        ids, scores = self.search_service.search(query_embedding, top_k)
-        ids = [UUID(id) for id in ids]
-        scores_map = {id: score for id, score in zip(ids, scores)}
+        return self.hydrate(db, [self.search(title, abstract, top_k)])[0]
+
+    def recommend_many(
+        self,
+        db: Session,
+        titles: List[str],
+        abstracts: List[str],
+        top_ks: List[int]
+    ) -> List[List[Dict[str, Any]]]:
+        return self.hydrate(db, self.search_many(titles, abstracts, top_ks))
+
+    def search(self, title: str, abstract: str, top_k: int) -> SearchResult:
+        cached_query = self.query_cache.get(title, abstract)
+        if cached_query is None:
+            # Cache the maximum number of neighbours so any later top_k can be served
+            # Batched embedding runs on the batcher thread, so time the wait for it here
+            with time_stage("embed"):
+                query_embedding = self.embedding_batcher.embed(title, abstract)
+            ids, scores, rows = self.search_service.search(query_embedding, self.max_top_k)
+            cached_query = CachedQuery(query_embedding, ids, scores, rows)
+            self.query_cache.set(title, abstract, cached_query)
 
-        papers = get_papers_by_ids(db, [id for id in ids])
-        papers_map = {paper.id: paper for paper in papers}
+        return cached_query.ids[:top_k], cached_query.scores[:top_k], cached_query.rows[:top_k]
 
+    def search_many(
+        self,
+        titles: List[str],
+        abstracts: List[str],
+        top_ks: List[int]
+    ) -> List[SearchResult]:
+        cached_queries = [
+            self.query_cache.get(title, abstract) for title, abstract in zip(titles, abstracts)
+        ]
+        uncached = [i for i, cached_query in enumerate(cached_queries) if cached_query is None]
+
+        if uncached:
+            with time_stage("embed"):
+                query_embeddings = self.embedding_service.embed_batch(
+                    [titles[i] for i in uncached],
+                    [abstracts[i] for i in uncached]
+                )
+            ids_per_query, scores_per_query, rows_per_query = self.search_service.search_batch(
+                query_embeddings,
+                self.max_top_k
+            )
+
+            for row, i in enumerate(uncached):
+                cached_queries[i] = CachedQuery(
+                    query_embeddings[row:row + 1],
+                    ids_per_query[row],
+                    scores_per_query[row],
+                    rows_per_query[row]
+                )
+                self.query_cache.set(titles[i], abstracts[i], cached_queries[i])
+
+        return [
+            (cached_query.ids[:top_k], cached_query.scores[:top_k], cached_query.rows[:top_k])
+            for cached_query, top_k in zip(cached_queries, top_ks)
+        ]
+
+    def hydrate(self, db: Session, results: List[SearchResult]) -> List[List[Dict[str, Any]]]:
+        # Load the union of all recommended papers in a single lookup
+        with time_stage("paper_lookup"):
+            if self.paper_store is not None:
+                papers_map, mismatched_ids = self._get_papers_from_store(results)
+                if mismatched_ids:
+                    papers_map.update(
+                        self._serialize_papers(get_papers_by_ids(db, mismatched_ids))
+                    )
+            else:
+                ids = self._get_unique_ids(results)
+                papers_map = self._serialize_papers(get_papers_by_ids(db, ids))
+        return self._build_recommendations(results, papers_map)
+
+    async def hydrate_async(
+        self,
+        db: AsyncSession,
+        results: List[SearchResult]
+    ) -> List[List[Dict[str, Any]]]:
+        with time_stage("paper_lookup"):
+            if self.paper_store is not None:
+                papers_map, mismatched_ids = self._get_papers_from_store(results)
+                if mismatched_ids:
+                    papers_map.update(self._serialize_papers(
+                        await get_papers_by_ids_async(db, mismatched_ids)
+                    ))
+            else:
+                ids = self._get_unique_ids(results)
+                papers_map = self._serialize_papers(await get_papers_by_ids_async(db, ids))
+        return self._build_recommendations(results, papers_map)
+
+    def _get_unique_ids(self, results: List[SearchResult]) -> List[UUID]:
+        return list({id for ids, _, _ in results for id in ids})
+
+    def _get_papers_from_store(
+        self,
+        results: List[SearchResult]
+    ) -> Tuple[Dict[UUID, Dict[str, Any]], List[UUID]]:
+        # Store rows follow the fused index, so search result rows are read directly
+        ids_by_row = {row: id for ids, _, rows in results for id, row in zip(ids, rows)}
+        papers = self.paper_store.get_papers(list(ids_by_row))
+
+        # Records holding another paper are left to the database rather than shown under
+        # the wrong ID
+        papers_map = {}
+        mismatched_ids = []
+        for id, paper in zip(ids_by_row.values(), papers):
+            if paper is None:
+                continue
+            if paper["id"] == str(id):
+                papers_map[id] = paper
+            else:
+                mismatched_ids.append(id)
+        return papers_map, mismatched_ids
+
+    def _serialize_papers(self, papers: List[Paper]) -> Dict[UUID, Dict[str, Any]]:
+        return {paper.id: serialize_paper(paper) for paper in papers}
+
+    def _build_recommendations(
+        self,
+        results: List[SearchResult],
+        papers_map: Dict[UUID, Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
         return [
-            {
-                "id": str(paper.id),
-                "title": paper.title,
-                "year": paper.year,
-                "abstract": paper.abstract,
-                "venue": paper.venue.name,
-                "authors": [
-                    {"first_name": author.first_name, "last_name": author.last_name}
-                    for author in paper.authors
-                ],
-                "recommendation_score": round(scores_map[paper.id], 4)
-            }
-            for id in ids
-            if (paper := papers_map.get(id)) is not None
+            [
+                {**paper, "recommendation_score": round(score, 4)}
+                for id, score in zip(ids, scores)
+                if (paper := papers_map.get(id)) is not None
+            ]
+            for ids, scores, _ in results
         ]
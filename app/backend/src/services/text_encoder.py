@@ -0,0 +1,86 @@
+import numpy as np
+import torch
+from abc import ABC, abstractmethod
+from transformers import AutoModel, AutoTokenizer
+from typing import Dict, List
+from src.core.metrics import time_stage
+from src.services.pooling import pool
+
+TORCH_BACKEND = "torch"
+ONNX_BACKEND = "onnx"
+
+
+class TextEncoder(ABC):
+    def __init__(self, model_dir: str, tokenizer_max_len: int, pooling: str):
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.tokenizer_max_len = tokenizer_max_len
+        self.pooling = pooling
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        with time_stage("tokenize"):
+            inputs = self.tokenizer(
+                texts,
+                max_length=self.tokenizer_max_len,
+                truncation=True,
+                padding=True,
+                return_tensors="np"
+            )
+
+        with time_stage("text_model"):
+            last_hidden_state = self._forward(dict(inputs))
+
+        return pool(last_hidden_state, inputs["attention_mask"], self.pooling)
+
+    @abstractmethod
+    def _forward(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        pass
+
+
+class TorchTextEncoder(TextEncoder):
+    def __init__(self, model_dir: str, tokenizer_max_len: int, pooling: str):
+        super().__init__(model_dir, tokenizer_max_len, pooling)
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = self._load_model(model_dir)
+
+    def _load_model(self, model_dir: str) -> AutoModel:
+        model = AutoModel.from_pretrained(model_dir, torch_dtype=torch.float32)
+        model = model.to(self.device)
+        model.eval()
+        return model
+
+    def _forward(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        tensors = {name: torch.from_numpy(value).to(self.device) for name, value in inputs.items()}
+        with torch.no_grad():
+            outputs = self.model(**tensors)
+        return outputs.last_hidden_state.cpu().numpy()
+
+
+class OnnxTextEncoder(TextEncoder):
+    def __init__(self, model_dir: str, tokenizer_max_len: int, pooling: str, onnx_path: str):
+        # Only imported when selected, so torch-only deployments do not load the runtime
+        import onnxruntime
+
+        super().__init__(model_dir, tokenizer_max_len, pooling)
+        self.session = onnxruntime.InferenceSession(
+            onnx_path,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def _forward(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        feed = {name: inputs[name].astype(np.int64) for name in self.input_names}
+        return self.session.run(["last_hidden_state"], feed)[0]
+
+
+def create_text_encoder(
+    backend: str,
+    model_dir: str,
+    tokenizer_max_len: int,
+    pooling: str,
+    onnx_path: str
+) -> TextEncoder:
+    if backend == TORCH_BACKEND:
+        return TorchTextEncoder(model_dir, tokenizer_max_len, pooling)
+    if backend == ONNX_BACKEND:
+        return OnnxTextEncoder(model_dir, tokenizer_max_len, pooling, onnx_path)
+    raise ValueError(f"Unknown text encoder backend: {backend}")
@@ -0,0 +1,33 @@
+import sys
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, Optional
+from src.core.database import get_db
+from src.crud.paper import get_papers_by_ids
+from src.services.paper_store import serialize_paper, write_paper_store
+from src.utils.id_table import IdTable, read_ids
+
+# Kept below SQLite's default limit on bound parameters
+PAPERS_CHUNK_SIZE = 500
+
+
+def iter_paper_records(db: Session, ids: IdTable) -> Iterator[Optional[Dict[str, Any]]]:
+    for start in range(0, len(ids), PAPERS_CHUNK_SIZE):
+        chunk_ids = ids.get_uuids(range(start, min(start + PAPERS_CHUNK_SIZE, len(ids))))
+        papers_map = {paper.id: paper for paper in get_papers_by_ids(db, chunk_ids)}
+
+        for id in chunk_ids:
+            paper = papers_map.get(id)
+            yield serialize_paper(paper) if paper is not None else None
+
+
+def build_paper_store(db: Session, ids_path: str, store_path: str) -> None:
+    write_paper_store(store_path, iter_paper_records(db, read_ids(ids_path)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Error: Expected a path to an index IDs file and an output store path.")
+        sys.exit(1)
+
+    with next(get_db()) as db:
+        build_paper_store(db, sys.argv[1], sys.argv[2])
@@ -0,0 +1,125 @@
+import sys
+import numpy as np
+from itertools import islice
+from uuid import UUID
+from typing import Dict, List, Tuple
+from src.services.embedding import EmbeddingService, get_query_texts
+from src.services.index_search import IndexSearchService
+from src.services.text_encoder import TextEncoder, TorchTextEncoder, OnnxTextEncoder
+from src.utils.file_utils import iter_papers
+from src.config.settings import (
+    TEXT_EMBEDDING_MODEL_DIR,
+    BERT_MAX_TOKENS,
+    TEXT_POOLING,
+    TEXT_ONNX_MODEL_PATH,
+    NUM_RECOMMENDATIONS_MAX
+)
+
+COMPARE_BATCH_SIZE = 16
+
+
+def compute_cosine_similarities(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    dot_products = (reference * candidate).sum(axis=1)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    return dot_products / np.clip(norms, 1e-12, None)
+
+
+def compute_overlap_at_k(reference_ids: List[List[UUID]], candidate_ids: List[List[UUID]]) -> float:
+    # Fraction of the reference top-K that the candidate also returns
+    overlaps = [
+        len(set(reference) & set(candidate)) / len(reference)
+        for reference, candidate in zip(reference_ids, candidate_ids)
+        if reference
+    ]
+    return float(np.mean(overlaps))
+
+
+def compute_precision_at_k(recommended_ids: List[List[UUID]], references: List[List[str]]) -> float:
+    # Cited papers are the ground truth, as in the research evaluation
+    precisions = [
+        len(set(recommended) & {UUID(id) for id in paper_references}) / len(recommended)
+        for recommended, paper_references in zip(recommended_ids, references)
+        if recommended and paper_references
+    ]
+    return float(np.mean(precisions))
+
+
+def run_encoder(
+    text_encoder: TextEncoder,
+    embedding_service: EmbeddingService,
+    search_service: IndexSearchService,
+    titles: List[str],
+    abstracts: List[str],
+    k: int
+) -> Tuple[np.ndarray, List[List[UUID]]]:
+    # The encoder is called directly, so the service keeps its own text encoder
+    text_embeddings = []
+    ids = []
+
+    for start in range(0, len(titles), COMPARE_BATCH_SIZE):
+        batch_titles = titles[start:start + COMPARE_BATCH_SIZE]
+        batch_abstracts = abstracts[start:start + COMPARE_BATCH_SIZE]
+        batch_text_embeddings = text_encoder.encode(get_query_texts(batch_titles, batch_abstracts))
+        text_embeddings.append(batch_text_embeddings)
+
+        query_embeddings = embedding_service.fuse(batch_text_embeddings)
+        batch_ids, _, _ = search_service.search_batch(query_embeddings, k)
+        ids.extend(batch_ids)
+
+    return np.vstack(text_embeddings), ids
+
+
+def compare_encoders(
+    reference_encoder: TextEncoder,
+    candidate_encoder: TextEncoder,
+    embedding_service: EmbeddingService,
+    search_service: IndexSearchService,
+    titles: List[str],
+    abstracts: List[str],
+    references: List[List[str]],
+    k: int
+) -> Dict[str, float]:
+    reference_embeddings, reference_ids = run_encoder(
+        reference_encoder, embedding_service, search_service, titles, abstracts, k
+    )
+    candidate_embeddings, candidate_ids = run_encoder(
+        candidate_encoder, embedding_service, search_service, titles, abstracts, k
+    )
+
+    similarities = compute_cosine_similarities(reference_embeddings, candidate_embeddings)
+    return {
+        "mean_cosine_similarity": float(similarities.mean()),
+        "min_cosine_similarity": float(similarities.min()),
+        f"overlap@{k}": compute_overlap_at_k(reference_ids, candidate_ids),
+        f"reference_P@{k}": compute_precision_at_k(reference_ids, references),
+        f"candidate_P@{k}": compute_precision_at_k(candidate_ids, references)
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Error: Expected a path to a papers JSON file and an optional number of papers.")
+        sys.exit(1)
+
+    from src.services.factory import create_recommendation_service
+
+    num_papers = int(sys.argv[2]) if len(sys.argv) == 3 else 1000
+    papers = list(islice(iter_papers(sys.argv[1]), num_papers))
+
+    recommendation_service = create_recommendation_service()
+    results = compare_encoders(
+        TorchTextEncoder(TEXT_EMBEDDING_MODEL_DIR, BERT_MAX_TOKENS, TEXT_POOLING),
+        OnnxTextEncoder(
+            TEXT_EMBEDDING_MODEL_DIR, BERT_MAX_TOKENS, TEXT_POOLING, TEXT_ONNX_MODEL_PATH
+        ),
+        recommendation_service.embedding_service,
+        recommendation_service.search_service,
+        [paper["title"] for paper in papers],
+        [paper["abstract"] for paper in papers],
+        [paper["references"] for paper in papers],
+        NUM_RECOMMENDATIONS_MAX
+    )
+    recommendation_service.close()
+
+    for metric, value in results.items():
+        print(f"{metric}: {value:.4f}")
@@ -0,0 +1,16 @@
+import sys
+from src.utils.id_table import read_ids, save_ids
+
+
+def convert_ids(pkl_path: str, npy_path: str) -> None:
+    id_table = read_ids(pkl_path)
+    save_ids(npy_path, id_table)
+    print(f"{len(id_table)} IDs saved to: {npy_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Error: Expected a path to a pickled IDs file and an output .npy path.")
+        sys.exit(1)
+
+    convert_ids(sys.argv[1], sys.argv[2])
@@ -0,0 +1,38 @@
+import os
+import sys
+import numpy as np
+import torch
+from mvlearn.embed import DCCA
+from typing import Dict
+from src.utils.file_utils import read_obj
+from src.services.projection import VIEWS
+
+
+def export_dcca(dcca_path: str, weights_path: str) -> None:
+    dcca: DCCA = read_obj(dcca_path)
+    weights: Dict[str, np.ndarray] = {}
+
+    networks = (dcca.deep_model_.model1_, dcca.deep_model_.model2_)
+    for view_idx, (view, network) in enumerate(zip(VIEWS, networks)):
+        linear_layers = [
+            module for module in network.modules() if isinstance(module, torch.nn.Linear)
+        ]
+        weights[f"{view}_num_layers"] = np.array(len(linear_layers))
+        for i, layer in enumerate(linear_layers):
+            weights[f"{view}_weight_{i}"] = layer.weight.detach().cpu().numpy()
+            weights[f"{view}_bias_{i}"] = layer.bias.detach().cpu().numpy()
+
+        weights[f"{view}_mean"] = np.asarray(dcca.linear_cca_.m_[view_idx])
+        weights[f"{view}_projection"] = np.asarray(dcca.linear_cca_.w_[view_idx])
+
+    os.makedirs(os.path.dirname(weights_path) or ".", exist_ok=True)
+    np.savez(weights_path, **weights)
+    print(f"DCCA weights saved to: {weights_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Error: Expected a path to a pickled DCCA model and an output weights path.")
+        sys.exit(1)
+
+    export_dcca(sys.argv[1], sys.argv[2])
@@ -0,0 +1,55 @@
+import inspect
+import os
+import sys
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+ONNX_OPSET_VERSION = 14
+
+
+def export_onnx(model_dir: str, onnx_path: str, quantize: bool = False) -> None:
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModel.from_pretrained(model_dir, torch_dtype=torch.float32)
+    model.config.return_dict = False
+    model.eval()
+
+    # Batch and sequence dimensions are left dynamic so any padded batch can be encoded
+    sample_inputs = tokenizer(["title", "title and abstract"], padding=True, return_tensors="pt")
+    # Inputs are passed positionally, so order them as in the model's forward signature
+    input_names = [
+        name for name in inspect.signature(model.forward).parameters if name in sample_inputs
+    ]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    dynamic_axes["pooler_output"] = {0: "batch"}
+
+    os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+    export_path = f"{onnx_path}.fp32" if quantize else onnx_path
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample_inputs[name] for name in input_names),
+            export_path,
+            input_names=input_names,
+            output_names=["last_hidden_state", "pooler_output"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET_VERSION,
+            do_constant_folding=True
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        # Weights of linear layers are stored as INT8 and activations quantised at runtime
+        quantize_dynamic(export_path, onnx_path, weight_type=QuantType.QInt8)
+        os.remove(export_path)
+
+    print(f"ONNX model saved to: {onnx_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4) or (len(sys.argv) == 4 and sys.argv[3] != "--quantize"):
+        print("Error: Expected a model directory, an output path and an optional --quantize flag.")
+        sys.exit(1)
+
+    export_onnx(sys.argv[1], sys.argv[2], quantize=len(sys.argv) == 4)
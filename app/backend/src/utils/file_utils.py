@@ -1,12 +1,30 @@
 import faiss
+import json
 import pickle
-from typing import Any
+from typing import Any, Dict, Iterator
 
 
-def read_embeddings(index_path: str) -> faiss.Index:
-    return faiss.read_index(index_path)
+def read_embeddings(index_path: str, mmap: bool = False) -> faiss.Index:
+    if not mmap:
+        return faiss.read_index(index_path)
+
+    # IVF indexes can memory-map their inverted lists, other indexes their flat vector storage
+    with open(index_path, "rb") as file:
+        fourcc = file.read(4)
+    io_flags = faiss.IO_FLAG_MMAP if fourcc.startswith(b"Iw") else faiss.IO_FLAG_MMAP_IFC
+    return faiss.read_index(index_path, io_flags | faiss.IO_FLAG_READ_ONLY)
 
 
 def read_obj(path: str) -> Any:
     with open(path, "rb") as file:
         return pickle.load(file)
+
+
+def iter_papers(papers_path: str) -> Iterator[Dict[str, Any]]:
+    # Papers files hold one JSON record per line between the enclosing brackets
+    with open(papers_path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip().rstrip(",")
+            if not line or line in ("[", "]"):
+                continue
+            yield json.loads(line)
@@ -0,0 +1,59 @@
+import hashlib
+import os
+import numpy as np
+from uuid import UUID
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.utils.file_utils import read_obj
+
+UUID_NUM_BYTES = 16
+
+
+class IdTable:
+    # Paper UUIDs stored as raw bytes, one row per index position
+    def __init__(self, ids: np.ndarray):
+        self.ids = ids
+        self._rows: Optional[Dict[bytes, int]] = None
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[str]) -> "IdTable":
+        data = b"".join(UUID(id).bytes for id in ids)
+        return cls(np.frombuffer(data, dtype=np.uint8).reshape(-1, UUID_NUM_BYTES))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get_hash(self) -> str:
+        return hashlib.sha1(np.ascontiguousarray(self.ids).tobytes()).hexdigest()
+
+    def keys(self) -> Iterator[bytes]:
+        for row in self.ids:
+            yield row.tobytes()
+
+    def get_uuid(self, row: int) -> UUID:
+        return UUID(bytes=self.ids[row].tobytes())
+
+    def get_uuids(self, rows: Iterable[int]) -> List[UUID]:
+        return [self.get_uuid(row) for row in rows]
+
+    def align(self, other: "IdTable") -> np.ndarray:
+        # Row in this table of each ID in the other table, in the other table's order
+        rows = self._get_row_index()
+        return np.fromiter((rows[key] for key in other.keys()), dtype=np.int64, count=len(other))
+
+    def _get_row_index(self) -> Dict[bytes, int]:
+        # Built on first use, as most callers only map rows to IDs
+        if self._rows is None:
+            self._rows = {key: row for row, key in enumerate(self.keys())}
+        return self._rows
+
+
+def read_ids(ids_path: str, mmap: bool = False) -> IdTable:
+    # Pickled lists of ID strings are still accepted, but must be converted on every load
+    if ids_path.endswith(".npy"):
+        return IdTable(np.load(ids_path, mmap_mode="r" if mmap else None))
+    return IdTable.from_ids(read_obj(ids_path))
+
+
+def save_ids(ids_path: str, id_table: IdTable) -> None:
+    os.makedirs(os.path.dirname(ids_path) or ".", exist_ok=True)
+    np.save(ids_path, np.ascontiguousarray(id_table.ids))
@@ -0,0 +1,21 @@
+import os
+import resource
+import sys
+from typing import Tuple
+
+
+def get_memory_usage_mb() -> Tuple[float, float]:
+    # Returns (resident, shared) memory of the current process; shared includes mmapped files
+    try:
+        with open("/proc/self/statm", 'r') as file:
+            _, resident_pages, shared_pages = file.read().split()[:3]
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return (
+            int(resident_pages) * page_size / 1024 / 1024,
+            int(shared_pages) * page_size / 1024 / 1024
+        )
+    except OSError:
+        # Fall back to peak RSS where /proc is unavailable (kilobytes on Linux, bytes on macOS)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return max_rss / divisor, 0.0
@@ -1,10 +1,14 @@
 import os
 import sys
-import json
+import tempfile
+import time
+import uuid
 from dotenv import load_dotenv
 from uuid import UUID
+from sqlalchemy import select, Table
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional, Set
 from src.models.base import Base
 from src.core.database import engine, get_db
 from src.models.paper import Paper
@@ -12,8 +16,10 @@ from src.models.venue import Venue
 from src.models.author import Author
 from src.models.paper_author import PaperAuthor
 from src.models.citation import Citation
+from src.utils.file_utils import iter_papers
 
 PAPERS_BATCH_THRESHOLD = 300
+BULK_CHUNK_SIZE = 10000
 
 
 def init_db(db_path: str) -> None:
@@ -23,14 +29,11 @@ def init_db(db_path: str) -> None:
 
 def populate_db(json_path: str) -> None:
     with next(get_db()) as db:
-        with open(json_path, 'r') as file:
-            papers_data = json.load(file)
-
         # Process papers
         papers_batch = {}
         paper_authors_batch = []
 
-        for paper_data in papers_data:
+        for paper_data in iter_papers(json_path):
             populate_paper(db, paper_data, papers_batch, paper_authors_batch)
 
             if len(papers_batch) >= PAPERS_BATCH_THRESHOLD:
@@ -48,7 +51,7 @@ def populate_db(json_path: str) -> None:
         # Process citations
         citations_batch = {}
 
-        for paper_data in papers_data:
+        for paper_data in iter_papers(json_path):
             populate_citation(db, paper_data, citations_batch)
 
             if len(citations_batch) >= PAPERS_BATCH_THRESHOLD:
@@ -142,13 +145,15 @@ def get_or_create_venue(db: Session, venue_name: str) -> Venue:
     return venue
 
 
-def get_or_create_author(db: Session, author_name: str) -> Author:
+def split_author_name(author_name: str) -> Tuple[str, Optional[str]]:
     name_parts = author_name.split(' ', 1)
     if len(name_parts) == 1:
-        first_name = name_parts[0]
-        last_name = None
-    else:
-        first_name, last_name = name_parts
+        return name_parts[0], None
+    return name_parts[0], name_parts[1]
+
+
+def get_or_create_author(db: Session, author_name: str) -> Author:
+    first_name, last_name = split_author_name(author_name)
 
     author = (
         db.query(Author)
@@ -173,11 +178,147 @@ def get_references(db: Session, ref_ids: List[str]) -> List[Paper]:
     return references
 
 
+class BulkLoader:
+    def __init__(self, db: Session, chunk_size: int = BULK_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.num_rows = 0
+        self.start_time = time.perf_counter()
+
+        # Preload existing keys so no per-row lookups are needed
+        self.paper_ids: Set[UUID] = set(db.scalars(select(Paper.id)))
+        self.venue_ids: Dict[str, UUID] = {
+            name: id for id, name in db.execute(select(Venue.id, Venue.name))
+        }
+        self.author_ids: Dict[Tuple[str, Optional[str]], UUID] = {
+            (first_name, last_name): id
+            for id, first_name, last_name in db.execute(
+                select(Author.id, Author.first_name, Author.last_name)
+            )
+        }
+
+        self.venue_rows: List[Dict[str, Any]] = []
+        self.author_rows: List[Dict[str, Any]] = []
+        self.paper_rows: List[Dict[str, Any]] = []
+        self.paper_author_rows: List[Dict[str, Any]] = []
+        self.citation_rows: List[Dict[str, Any]] = []
+
+    def add_paper(self, paper_data: Dict[str, Any]) -> None:
+        paper_id = UUID(paper_data["id"])
+        if paper_id in self.paper_ids:
+            return
+        self.paper_ids.add(paper_id)
+
+        self.paper_rows.append({
+            "id": paper_id,
+            "title": paper_data["title"],
+            "year": paper_data["year"],
+            "abstract": paper_data["abstract"],
+            "venue_id": self._get_or_create_venue_id(paper_data["venue"])
+        })
+
+        author_ids = {self._get_or_create_author_id(name) for name in paper_data["authors"]}
+        self.paper_author_rows.extend(
+            {"paper_id": paper_id, "author_id": author_id} for author_id in author_ids
+        )
+
+        if len(self.paper_rows) >= self.chunk_size:
+            self.flush_papers()
+
+    def add_citation(self, citing_id: UUID, cited_id: UUID) -> None:
+        # Duplicate edges are dropped by the conflict clause on insert
+        if cited_id not in self.paper_ids:
+            return
+
+        self.citation_rows.append({"citing_paper_id": citing_id, "cited_paper_id": cited_id})
+        if len(self.citation_rows) >= self.chunk_size:
+            self.flush_citations()
+
+    def flush_papers(self) -> None:
+        # Insert parents before children to satisfy foreign keys
+        self._insert(Venue.__table__, self.venue_rows)
+        self._insert(Author.__table__, self.author_rows)
+        self._insert(Paper.__table__, self.paper_rows)
+        self._insert(PaperAuthor.__table__, self.paper_author_rows)
+        self.db.commit()
+        self._report()
+
+    def flush_citations(self) -> None:
+        self._insert(Citation.__table__, self.citation_rows)
+        self.db.commit()
+        self._report()
+
+    def _get_or_create_venue_id(self, venue_name: str) -> UUID:
+        venue_id = self.venue_ids.get(venue_name)
+        if venue_id is None:
+            venue_id = uuid.uuid4()
+            self.venue_ids[venue_name] = venue_id
+            self.venue_rows.append({"id": venue_id, "name": venue_name})
+        return venue_id
+
+    def _get_or_create_author_id(self, author_name: str) -> UUID:
+        name = split_author_name(author_name)
+        author_id = self.author_ids.get(name)
+        if author_id is None:
+            author_id = uuid.uuid4()
+            self.author_ids[name] = author_id
+            self.author_rows.append({"id": author_id, "first_name": name[0], "last_name": name[1]})
+        return author_id
+
+    def _insert(self, table: Table, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(table).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            statement = sqlite.insert(table).on_conflict_do_nothing()
+        else:
+            statement = table.insert()
+
+        self.db.execute(statement, rows)
+        self.num_rows += len(rows)
+        rows.clear()
+
+    def _report(self) -> None:
+        elapsed = time.perf_counter() - self.start_time
+        rate = self.num_rows / elapsed
+        print(f"Inserted {self.num_rows} rows in {elapsed:.1f}s ({rate:.0f} rows/s)")
+
+
+def populate_db_bulk(db: Session, json_path: str) -> None:
+    loader = BulkLoader(db)
+
+    # Citations may reference papers later in the file, so spill them to disk until all
+    # papers are inserted rather than holding the dataset in memory
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as citations_file:
+        for paper_data in iter_papers(json_path):
+            loader.add_paper(paper_data)
+            citations_file.writelines(
+                f"{paper_data['id']}\t{ref_id}\n" for ref_id in paper_data["references"]
+            )
+        loader.flush_papers()
+
+        citations_file.seek(0)
+        for line in citations_file:
+            citing_id, cited_id = line.rstrip("\n").split("\t")
+            loader.add_citation(UUID(citing_id), UUID(cited_id))
+        loader.flush_citations()
+
+    print("Database populated successfully!")
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Error: Expected a path to a papers JSON file.")
+    if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] != "--bulk"):
+        print("Error: Expected a path to a papers JSON file and an optional --bulk flag.")
         sys.exit(1)
 
     load_dotenv()
     init_db(os.getenv("DATABASE_URL"))
-    populate_db(sys.argv[1])
+
+    if len(sys.argv) == 3:
+        with next(get_db()) as db:
+            populate_db_bulk(db, sys.argv[1])
+    else:
+        populate_db(sys.argv[1])
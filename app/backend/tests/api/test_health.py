@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 from src.app import app
 
@@ -13,3 +14,25 @@ def test_health_check(client: TestClient):
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_cache_stats(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    recommendation_service = MagicMock()
+    recommendation_service.query_cache.stats.return_value = {"hits": 3, "misses": 1, "size": 1}
+    monkeypatch.setattr(
+        app.state, "recommendation_service", recommendation_service, raising=False
+    )
+
+    response = client.get("/api/health/cache")
+
+    assert response.status_code == 200
+    assert response.json() == {"hits": 3, "misses": 1, "size": 1}
+
+
+def test_db_pool_stats(client: TestClient):
+    response = client.get("/api/health/db")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    for pool_stats in response.json().values():
+        assert set(pool_stats) == {"size", "checked_in", "checked_out", "overflow"}
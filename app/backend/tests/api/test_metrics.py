@@ -0,0 +1,35 @@
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.app import app
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    return TestClient(app)
+
+
+def test_metrics(client: TestClient):
+    client.get("/api/health/")
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'route="health_check",status="200"' in response.text
+    assert "# TYPE query_cache_requests_total counter" in response.text
+    assert 'db_pool_checked_out_connections{engine="async"}' in response.text
+
+
+def test_server_timing_disabled(client: TestClient):
+    response = client.get("/api/health/")
+
+    assert "Server-Timing" not in response.headers
+
+
+def test_server_timing_enabled(client: TestClient):
+    with patch("src.app.SERVER_TIMING_ENABLED", True):
+        response = client.get("/api/health/")
+
+    assert response.headers["Server-Timing"].startswith("total;dur=")
@@ -1,10 +1,16 @@
 import pytest
 from unittest.mock import patch
+from uuid import UUID
 from fastapi.testclient import TestClient
 from typing import Generator
 from src.services.recommendation import RecommendationService
+from src.core.executor import BoundedExecutor
 from src.app import app
-from src.config.settings import NUM_RECOMMENDATIONS_MIN, NUM_RECOMMENDATIONS_MAX
+from src.config.settings import (
+    NUM_RECOMMENDATIONS_MIN,
+    NUM_RECOMMENDATIONS_MAX,
+    MAX_BATCH_REQUESTS
+)
 
 
 mock_recommendations = [
@@ -19,21 +25,35 @@ mock_recommendations = [
     }
 ]
 
+mock_search_result = ([UUID(int=1)], [95])
+
 
 @pytest.fixture
 def mock_recommendation_service() -> Generator[RecommendationService, None, None]:
     with patch.object(
         RecommendationService,
-        "recommend",
-        return_value=mock_recommendations
+        "search",
+        return_value=mock_search_result
+    ), patch.object(
+        RecommendationService,
+        "search_many",
+        side_effect=lambda titles, abstracts, top_ks: [mock_search_result for _ in titles]
+    ), patch.object(
+        RecommendationService,
+        "hydrate_async",
+        side_effect=lambda db, results: [mock_recommendations for _ in results]
     ):
         yield RecommendationService
 
 
 @pytest.fixture()
-def client(mock_recommendation_service: RecommendationService) -> TestClient:
+def client(mock_recommendation_service: RecommendationService) -> Generator[TestClient, None, None]:
     app.state.recommendation_service = mock_recommendation_service
-    return TestClient(app)
+    app.state.inference_executor = BoundedExecutor("inference", max_workers=1, max_pending=1)
+    app.state.pdf_executor = BoundedExecutor("pdf", max_workers=1, max_pending=1)
+    yield TestClient(app)
+    app.state.inference_executor.shutdown()
+    app.state.pdf_executor.shutdown()
 
 
 def test_recommend_papers(client: TestClient, mock_recommendation_service: RecommendationService):
@@ -51,12 +71,13 @@ def test_recommend_papers(client: TestClient, mock_recommendation_service: Recom
     assert len(data["papers"]) == 1
     assert data["papers"][0] == mock_recommendations[0]
 
-    mock_recommendation_service.recommend.assert_called_once_with(
-        mock_recommendation_service.recommend.call_args[0][0],
+    mock_recommendation_service.search.assert_called_once_with(
         request_data["title"],
         request_data["abstract"],
-        mock_recommendation_service.recommend.call_args[0][3]
+        request_data["numRecommendations"]
     )
+    hydrate_args = mock_recommendation_service.hydrate_async.call_args[0]
+    assert hydrate_args[1] == [mock_search_result]
 
 
 def test_recommend_papers_invalid_types(client: TestClient):
@@ -111,7 +132,19 @@ def test_recommend_papers_exception(
     client: TestClient,
     mock_recommendation_service: RecommendationService
 ):
-    mock_recommendation_service.recommend.side_effect = Exception("Internal Server Error")
+    mock_recommendation_service.search.side_effect = Exception("Internal Server Error")
+    request_data = {
+        "title": "Example title",
+        "abstract": "Example abstract",
+        "numRecommendations": 10
+    }
+
+    response = client.post("/api/v1/recommendations", json=request_data)
+    assert response.status_code == 500
+
+
+def test_recommend_papers_executor_saturated(client: TestClient):
+    app.state.inference_executor = BoundedExecutor("inference", max_workers=1, max_pending=0)
     request_data = {
         "title": "Example title",
         "abstract": "Example abstract",
@@ -119,4 +152,76 @@ def test_recommend_papers_exception(
     }
 
     response = client.post("/api/v1/recommendations", json=request_data)
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Server is busy. Please try again later."
+
+
+def test_recommend_papers_batch(
+    client: TestClient,
+    mock_recommendation_service: RecommendationService
+):
+    request_data = {
+        "requests": [
+            {"title": "Example title 1", "abstract": "Example abstract 1", "numRecommendations": 5},
+            {"title": "Example title 2", "abstract": "Example abstract 2", "numRecommendations": 10}
+        ]
+    }
+
+    response = client.post("/api/v1/recommendations/batch", json=request_data)
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert len(data["results"]) == 2
+    for result in data["results"]:
+        assert result["papers"] == mock_recommendations
+
+    args = mock_recommendation_service.search_many.call_args[0]
+    assert args[0] == ["Example title 1", "Example title 2"]
+    assert args[1] == ["Example abstract 1", "Example abstract 2"]
+    assert args[2] == [5, 10]
+    hydrate_args = mock_recommendation_service.hydrate_async.call_args[0]
+    assert hydrate_args[1] == [mock_search_result, mock_search_result]
+
+
+def test_recommend_papers_batch_too_many_requests(client: TestClient):
+    request_data = {
+        "requests": [
+            {"title": "Example title", "abstract": "Example abstract", "numRecommendations": 10}
+        ] * (MAX_BATCH_REQUESTS + 1)
+    }
+
+    response = client.post("/api/v1/recommendations/batch", json=request_data)
+    assert response.status_code == 422
+
+    data = response.json()
+    assert data["detail"][0]["msg"] == (
+        f"Value error, requests must contain between 1 and {MAX_BATCH_REQUESTS} items"
+    )
+
+
+@pytest.mark.parametrize("request_data", [
+    [1, 2],
+    {"requests": 5},
+    {"requests": [1]},
+    {"requests": []}
+])
+def test_recommend_papers_batch_invalid_types(client: TestClient, request_data):
+    response = client.post("/api/v1/recommendations/batch", json=request_data)
+
+    assert response.status_code == 422
+
+
+def test_recommend_papers_batch_exception(
+    client: TestClient,
+    mock_recommendation_service: RecommendationService
+):
+    mock_recommendation_service.search_many.side_effect = Exception("Internal Server Error")
+    request_data = {
+        "requests": [
+            {"title": "Example title", "abstract": "Example abstract", "numRecommendations": 10}
+        ]
+    }
+
+    response = client.post("/api/v1/recommendations/batch", json=request_data)
     assert response.status_code == 500
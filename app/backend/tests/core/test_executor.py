@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import pytest
+from typing import Generator
+from src.core.executor import BoundedExecutor, ExecutorSaturatedError
+
+
+@pytest.fixture
+def executor() -> Generator[BoundedExecutor, None, None]:
+    executor = BoundedExecutor("test", max_workers=1, max_pending=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_run_off_event_loop(executor: BoundedExecutor):
+    async def run() -> str:
+        return await executor.run(lambda: threading.current_thread().name)
+
+    thread_name = asyncio.run(run())
+
+    assert thread_name.startswith("test")
+    assert executor.num_pending == 0
+
+
+def test_run_saturated(executor: BoundedExecutor):
+    release = threading.Event()
+
+    async def run() -> None:
+        tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert executor.num_pending == 0
+
+
+def test_run_propagates_exception(executor: BoundedExecutor):
+    def fail() -> None:
+        raise RuntimeError("Task failed")
+
+    with pytest.raises(RuntimeError, match="Task failed"):
+        asyncio.run(executor.run(fail))
+    assert executor.num_pending == 0
+
+
+def test_cancelled_run_counts_until_finished(executor: BoundedExecutor):
+    started = threading.Event()
+    release = threading.Event()
+
+    async def run() -> None:
+        task = asyncio.create_task(executor.run(lambda: started.set() or release.wait()))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+
+        # The worker thread is still busy after the awaiting request is cancelled
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert executor.num_pending == 1
+
+        release.set()
+
+    asyncio.run(run())
+    executor.shutdown()
+    assert executor.num_pending == 0
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import pytest
+from prometheus_client import REGISTRY
+from src.core.metrics import stage_timings, time_stage, format_server_timing, render_metrics
+
+
+def get_sample_value(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_time_stage():
+    count = get_sample_value("recommendation_stage_duration_seconds_count", stage="test_stage")
+    timings = {}
+    token = stage_timings.set(timings)
+
+    with time_stage("test_stage"):
+        pass
+    with time_stage("test_stage"):
+        pass
+    stage_timings.reset(token)
+
+    assert get_sample_value(
+        "recommendation_stage_duration_seconds_count",
+        stage="test_stage"
+    ) == count + 2
+    assert list(timings) == ["test_stage"]
+
+
+def test_time_stage_counts_errors():
+    errors = get_sample_value("recommendation_stage_errors_total", stage="failing_stage")
+
+    with pytest.raises(ValueError):
+        with time_stage("failing_stage"):
+            raise ValueError()
+
+    assert get_sample_value(
+        "recommendation_stage_errors_total",
+        stage="failing_stage"
+    ) == errors + 1
+
+
+def test_format_server_timing():
+    assert format_server_timing({"embed": 0.0123, "total": 0.02}) == (
+        "embed;dur=12.3, total;dur=20.0"
+    )
+
+
+def test_render_metrics_aggregates_workers(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    # Each worker process writes its own metrics files to the shared directory
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    script = (
+        "from src.core.metrics import QUERY_CACHE_REQUESTS; "
+        "QUERY_CACHE_REQUESTS.labels(result='hit').inc()"
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", script], check=True, env=os.environ)
+
+    assert 'query_cache_requests_total{result="hit"} 2.0' in render_metrics().decode()
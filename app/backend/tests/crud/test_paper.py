@@ -1,11 +1,15 @@
+import asyncio
 import pytest
+import sqlite3
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from uuid import UUID
-from typing import Generator
+from typing import Generator, List
 from src.models.base import Base
 from src.models import Paper, Venue, Author, Citation
-from src.crud.paper import get_papers_by_ids
+from src.core.database import create_async_db_engine
+from src.crud.paper import get_papers_by_ids, get_papers_by_ids_async
 
 
 @pytest.fixture
@@ -100,3 +104,26 @@ def test_get_papers_by_ids_missing(fake_db: Session):
 
     papers = get_papers_by_ids(fake_db, missing_ids)
     assert len(papers) == 0
+
+
+def test_get_papers_by_ids_async(fake_db: Session, tmp_path):
+    # Copy the fake data into a file so the async engine can read it
+    database_url = f"sqlite:///{tmp_path / 'papers.db'}"
+    fake_db.connection().connection.backup(sqlite3.connect(tmp_path / "papers.db"))
+    async_engine = create_async_db_engine(database_url)
+    ids = [
+        UUID("0abc9de7-e047-44fc-998d-4bf02b9bc9ab"),
+        UUID("00000000-0000-0000-0000-000000000000")
+    ]
+
+    async def run() -> List[Paper]:
+        async with AsyncSession(async_engine) as db:
+            papers = await get_papers_by_ids_async(db, ids)
+        await async_engine.dispose()
+        return papers
+
+    papers = asyncio.run(run())
+    assert len(papers) == 1
+    assert papers[0].title == "Paper 1"
+    assert papers[0].venue.name == "Venue 1"
+    assert [author.first_name for author in papers[0].authors] == ["John", "Jane"]
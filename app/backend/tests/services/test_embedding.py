@@ -0,0 +1,94 @@
+import pytest
+import faiss
+import numpy as np
+from unittest.mock import patch, MagicMock
+from uuid import UUID
+from typing import Generator
+from src.services.embedding import EmbeddingService
+from src.services.text_encoder import TextEncoder
+from src.utils.id_table import IdTable
+
+TEXT_IDS = [str(UUID(int=i)) for i in range(1, 5)]
+NODE_IDS = [TEXT_IDS[2], TEXT_IDS[0], TEXT_IDS[3], TEXT_IDS[1]]
+
+
+def build_text_index() -> faiss.Index:
+    text_index = faiss.IndexFlatIP(4)
+    text_index.add(np.eye(4, dtype=np.float32))
+    return text_index
+
+
+def build_node_index() -> faiss.Index:
+    # Node embedding of each paper is its text position repeated, stored in node ID order
+    node_index = faiss.IndexFlatIP(2)
+    node_index.add(np.array(
+        [[TEXT_IDS.index(id)] * 2 for id in NODE_IDS],
+        dtype=np.float32
+    ))
+    return node_index
+
+
+@pytest.fixture
+def embedding_service() -> Generator[EmbeddingService, None, None]:
+    id_tables = {
+        "text_ids_path": IdTable.from_ids(TEXT_IDS),
+        "node_ids_path": IdTable.from_ids(NODE_IDS)
+    }
+    indexes = {"text_index_path": build_text_index(), "node_index_path": build_node_index()}
+
+    with patch("src.services.embedding.DccaProjector"), \
+            patch("src.services.embedding.read_ids", side_effect=lambda path: id_tables[path]), \
+            patch(
+                "src.services.embedding.read_embeddings",
+                side_effect=lambda path, mmap: indexes[path]
+            ):
+        yield EmbeddingService(
+            MagicMock(spec=TextEncoder),
+            "text_index_path",
+            "text_ids_path",
+            "node_index_path",
+            "node_ids_path",
+            num_node_neighbours=2,
+            fusion_weights_path="fusion_weights_path",
+            node_centroid_cache_size=16
+        )
+
+
+def test_node_embeddings_aligned_to_text_ids(embedding_service: EmbeddingService):
+    assert embedding_service.node_embeddings.flags["C_CONTIGUOUS"]
+    assert embedding_service.node_embeddings[:, 0].tolist() == [0, 1, 2, 3]
+
+
+def test_embed_node(embedding_service: EmbeddingService):
+    queries = np.array([
+        [1.0, 0.9, 0.0, 0.0],
+        [0.0, 0.0, 0.9, 1.0]
+    ], dtype=np.float32)
+
+    node_embeddings = embedding_service._embed_node(queries)
+
+    assert node_embeddings.tolist() == [[0.5, 0.5], [2.5, 2.5]]
+
+
+def test_embed_node_caches_centroids(embedding_service: EmbeddingService):
+    queries = np.array([
+        [1.0, 0.9, 0.0, 0.0],
+        [0.9, 1.0, 0.0, 0.0]
+    ], dtype=np.float32)
+
+    embedding_service._embed_node(queries)
+    cache_info = embedding_service._node_centroid.cache_info()
+
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
+
+
+def test_embed_text(embedding_service: EmbeddingService):
+    embedding_service.text_encoder.encode.return_value = np.ones((2, 4), dtype=np.float32)
+
+    text_embeddings = embedding_service.embed_text(["Title 1", "Title 2"], ["Abs 1", "Abs 2"])
+
+    assert text_embeddings.shape == (2, 4)
+    embedding_service.text_encoder.encode.assert_called_once_with(
+        ["Title 1 Abs 1", "Title 2 Abs 2"]
+    )
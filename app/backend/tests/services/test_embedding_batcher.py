@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from typing import Generator, List
+from src.services.embedding import EmbeddingService
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.core.executor import BoundedExecutor
+from src.config.settings import (
+    EMBEDDING_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WORKERS,
+    INFERENCE_MAX_PENDING
+)
+
+
+def fake_embed_batch(titles: List[str], abstracts: List[str]) -> np.ndarray:
+    return np.array([[len(title), len(abstract)] for title, abstract in zip(titles, abstracts)])
+
+
+@pytest.fixture
+def mock_embedding_service() -> MagicMock:
+    mock_embedding_service = MagicMock(spec=EmbeddingService)
+    mock_embedding_service.embed_batch.side_effect = fake_embed_batch
+    return mock_embedding_service
+
+
+@pytest.fixture
+def batcher(mock_embedding_service: MagicMock) -> Generator[EmbeddingBatcher, None, None]:
+    batcher = EmbeddingBatcher(mock_embedding_service, max_batch_size=8, max_wait_ms=50)
+    yield batcher
+    batcher.close()
+
+
+def test_embed_returns_row_for_query(batcher: EmbeddingBatcher):
+    embedding = batcher.embed("Title", "An abstract")
+
+    assert embedding.shape == (1, 2)
+    assert embedding.tolist() == [[5, 11]]
+
+
+def test_embed_batches_concurrent_queries(
+    batcher: EmbeddingBatcher,
+    mock_embedding_service: MagicMock
+):
+    queries = [("t" * i, "a" * (i + 1)) for i in range(1, 9)]
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        embeddings = list(executor.map(lambda query: batcher.embed(*query), queries))
+
+    for (title, abstract), embedding in zip(queries, embeddings):
+        assert embedding.tolist() == [[len(title), len(abstract)]]
+
+    batch_calls = mock_embedding_service.embed_batch.call_args_list
+    num_embedded = sum(len(call.args[0]) for call in batch_calls)
+    assert num_embedded == len(queries)
+    assert mock_embedding_service.embed_batch.call_count < len(queries)
+
+
+def test_embed_propagates_exception(batcher: EmbeddingBatcher, mock_embedding_service: MagicMock):
+    mock_embedding_service.embed_batch.side_effect = RuntimeError("Inference failed")
+
+    with pytest.raises(RuntimeError, match="Inference failed"):
+        batcher.embed("Title", "Abstract")
+
+
+def test_embed_without_batching(mock_embedding_service: MagicMock):
+    mock_embedding_service.embed.return_value = np.array([[1.0, 2.0]])
+    batcher = EmbeddingBatcher(mock_embedding_service, max_batch_size=1, max_wait_ms=50)
+
+    embedding = batcher.embed("Title", "Abstract")
+
+    assert embedding.tolist() == [[1.0, 2.0]]
+    mock_embedding_service.embed.assert_called_once_with("Title", "Abstract")
+    mock_embedding_service.embed_batch.assert_not_called()
+
+
+def test_inference_executor_fills_batches(mock_embedding_service: MagicMock):
+    # Each caller holds an inference thread while it waits, so the executor must not cap batches
+    batcher = EmbeddingBatcher(
+        mock_embedding_service,
+        max_batch_size=EMBEDDING_MAX_BATCH_SIZE,
+        max_wait_ms=1000
+    )
+    executor = BoundedExecutor("inference", INFERENCE_MAX_WORKERS, INFERENCE_MAX_PENDING)
+
+    async def run() -> None:
+        await asyncio.gather(*[
+            executor.run(batcher.embed, "Title", "An abstract")
+            for _ in range(EMBEDDING_MAX_BATCH_SIZE)
+        ])
+
+    asyncio.run(run())
+    executor.shutdown()
+    batcher.close()
+
+    batch_sizes = [len(call.args[0]) for call in mock_embedding_service.embed_batch.call_args_list]
+    assert batch_sizes == [EMBEDDING_MAX_BATCH_SIZE]
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from typing import Generator
-from src.services.factory import create_recommendation_service
+from src.services.factory import create_recommendation_service, check_paper_store
 from src.services.recommendation import RecommendationService
 
 
@@ -21,12 +21,37 @@ def mock_search_service() -> Generator[MagicMock, None, None]:
         yield mock_instance
 
 
+@pytest.fixture
+def mock_create_text_encoder() -> Generator[MagicMock, None, None]:
+    with patch("src.services.factory.create_text_encoder") as mock_create_text_encoder:
+        yield mock_create_text_encoder
+
+
 def test_create_recommendation_service(
+    mock_create_text_encoder: MagicMock,
     mock_embedding_service: MagicMock,
     mock_search_service: MagicMock
 ):
     recommendation_service = create_recommendation_service()
 
+    mock_create_text_encoder.assert_called_once()
+
     assert isinstance(recommendation_service, RecommendationService)
     assert recommendation_service.embedding_service == mock_embedding_service
     assert recommendation_service.search_service == mock_search_service
+    assert recommendation_service.embedding_batcher.embedding_service == mock_embedding_service
+
+
+@pytest.mark.parametrize("num_store_rows, num_ids", [(3, 3), (2, 3), (3, 2)])
+def test_check_paper_store(num_store_rows: int, num_ids: int):
+    paper_store = MagicMock()
+    paper_store.__len__.return_value = num_store_rows
+    search_service = MagicMock()
+    search_service.ids.__len__.return_value = num_ids
+    search_service.index.ntotal = 3
+
+    if num_store_rows == num_ids == 3:
+        check_paper_store(paper_store, search_service)
+    else:
+        with pytest.raises(ValueError, match="Rebuild the paper store"):
+            check_paper_store(paper_store, search_service)
@@ -0,0 +1,84 @@
+import pytest
+import faiss
+import numpy as np
+from unittest.mock import patch
+from uuid import UUID
+from typing import Generator, List
+from src.services.index_search import IndexSearchService
+from src.utils.id_table import IdTable
+
+IDS = [UUID(int=i) for i in range(1000)]
+
+
+def build_embeddings() -> np.ndarray:
+    embeddings = np.random.default_rng(0).random((len(IDS), 16), dtype=np.float32)
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
+
+def create_search_service(index: faiss.Index, ids: List[UUID]) -> IndexSearchService:
+    id_table = IdTable.from_ids(str(id) for id in ids)
+    with patch("src.services.index_search.read_embeddings", return_value=index), \
+            patch("src.services.index_search.read_ids", return_value=id_table):
+        return IndexSearchService("fake_index_path", "fake_ids_path", nprobe=8, ef_search=32)
+
+
+@pytest.fixture
+def flat_search_service() -> Generator[IndexSearchService, None, None]:
+    index = faiss.IndexFlatIP(16)
+    index.add(build_embeddings())
+    yield create_search_service(index, IDS)
+
+
+def test_search(flat_search_service: IndexSearchService):
+    query = build_embeddings()[3:4]
+
+    ids, scores, rows = flat_search_service.search(query, 5)
+
+    assert len(ids) == 5
+    assert ids[0] == IDS[3]
+    assert ids == [IDS[row] for row in rows]
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_batch(flat_search_service: IndexSearchService):
+    queries = build_embeddings()[[3, 7, 11]]
+
+    ids, scores, rows = flat_search_service.search_batch(queries, 4)
+
+    assert [row[0] for row in ids] == [IDS[3], IDS[7], IDS[11]]
+    assert [query_rows[0] for query_rows in rows] == [3, 7, 11]
+    assert all(len(row) == 4 for row in scores)
+
+
+def test_search_parameters_ivf():
+    embeddings = build_embeddings()
+    index = faiss.index_factory(16, "IVF16,Flat", faiss.METRIC_INNER_PRODUCT)
+    index.train(embeddings)
+    index.add(embeddings)
+
+    create_search_service(index, IDS)
+
+    assert faiss.extract_index_ivf(index).nprobe == 8
+
+
+def test_search_parameters_hnsw():
+    index = faiss.index_factory(16, "HNSW8,Flat", faiss.METRIC_INNER_PRODUCT)
+    index.add(build_embeddings())
+
+    create_search_service(index, IDS)
+
+    assert faiss.downcast_index(index).hnsw.efSearch == 32
+
+
+def test_search_drops_missing_neighbours():
+    embeddings = build_embeddings()
+    index = faiss.IndexFlatIP(16)
+    index.add(embeddings[:3])
+    search_service = create_search_service(index, IDS[:3])
+
+    ids, scores, rows = search_service.search(embeddings[:1], 5)
+
+    assert ids[0] == IDS[0]
+    assert len(ids) == len(scores) == len(rows) == 3
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+from src.services.paper_store import PaperStore, serialize_paper, write_paper_store
+
+PAPERS = [
+    {
+        "id": "1",
+        "title": "Paper 1",
+        "year": 2025,
+        "abstract": "Abstract for paper 1 – with unicode",
+        "venue": "Venue 1",
+        "authors": [{"first_name": "John", "last_name": "Doe"}]
+    },
+    None,
+    {
+        "id": "3",
+        "title": "Paper 3",
+        "year": 2024,
+        "abstract": "Abstract for paper 3",
+        "venue": "Venue 2",
+        "authors": []
+    }
+]
+
+
+def test_serialize_paper():
+    author = MagicMock(first_name="John", last_name="Doe")
+    paper = MagicMock(id=1, title="Paper 1", year=2025, abstract="Abstract", authors=[author])
+    paper.venue.name = "Venue 1"
+
+    assert serialize_paper(paper) == {
+        "id": "1",
+        "title": "Paper 1",
+        "year": 2025,
+        "abstract": "Abstract",
+        "venue": "Venue 1",
+        "authors": [{"first_name": "John", "last_name": "Doe"}]
+    }
+
+
+def test_paper_store(tmp_path):
+    store_path = str(tmp_path / "papers")
+    write_paper_store(store_path, PAPERS)
+
+    paper_store = PaperStore(store_path)
+
+    assert len(paper_store) == 3
+    assert paper_store.get_paper(0) == PAPERS[0]
+    assert paper_store.get_paper(1) is None
+    assert paper_store.get_papers([2, 0]) == [PAPERS[2], PAPERS[0]]
+
+
+def test_paper_store_without_papers(tmp_path):
+    store_path = str(tmp_path / "papers")
+    write_paper_store(store_path, [None, None])
+
+    paper_store = PaperStore(store_path)
+
+    assert len(paper_store) == 2
+    assert paper_store.get_papers([0, 1]) == [None, None]
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from src.services.pooling import pool, MEAN_POOLING, CLS_POOLING
+
+
+@pytest.fixture
+def padded_batch():
+    rng = np.random.default_rng(0)
+    last_hidden_state = rng.normal(size=(2, 4, 3)).astype(np.float32)
+    attention_mask = np.array([[1, 1, 1, 1], [1, 1, 0, 0]])
+    return last_hidden_state, attention_mask
+
+
+def test_mean_pooling_ignores_padding(padded_batch):
+    last_hidden_state, attention_mask = padded_batch
+
+    embeddings = pool(last_hidden_state, attention_mask, MEAN_POOLING)
+
+    assert embeddings.dtype == np.float32
+    np.testing.assert_allclose(embeddings[0], last_hidden_state[0].mean(axis=0), rtol=1e-6)
+    np.testing.assert_allclose(embeddings[1], last_hidden_state[1, :2].mean(axis=0), rtol=1e-6)
+
+
+def test_mean_pooling_matches_unpadded_batch(padded_batch):
+    last_hidden_state, attention_mask = padded_batch
+
+    padded = pool(last_hidden_state, attention_mask, MEAN_POOLING)[1]
+    unpadded = pool(last_hidden_state[1:, :2], attention_mask[1:, :2], MEAN_POOLING)[0]
+
+    np.testing.assert_allclose(padded, unpadded, rtol=1e-6)
+
+
+def test_cls_pooling(padded_batch):
+    last_hidden_state, attention_mask = padded_batch
+
+    embeddings = pool(last_hidden_state, attention_mask, CLS_POOLING)
+
+    np.testing.assert_array_equal(embeddings, last_hidden_state[:, 0])
+
+
+def test_unknown_pooling(padded_batch):
+    with pytest.raises(ValueError, match="Unknown pooling strategy"):
+        pool(*padded_batch, "max")
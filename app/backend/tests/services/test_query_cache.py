@@ -0,0 +1,128 @@
+import sqlite3
+import pytest
+import numpy as np
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+from src.services.query_cache import (
+    CachedQuery,
+    QueryCache,
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+    create_query_cache
+)
+from src.utils.id_table import IdTable
+
+
+def make_cached_query(value: float) -> CachedQuery:
+    return CachedQuery(np.array([[value, value]]), ["id-1", "id-2"], [0.9, 0.8], [1, 2])
+
+
+def test_make_key_normalizes_text():
+    key = QueryCache.make_key("A  Title", "Some\nabstract ")
+
+    assert key == QueryCache.make_key("a title", "some abstract")
+    assert key != QueryCache.make_key("a title", "other abstract")
+    assert key != QueryCache.make_key("a title", "some abstract", "other version")
+
+
+def get_cache_requests(result: str) -> float:
+    return REGISTRY.get_sample_value("query_cache_requests_total", {"result": result}) or 0.0
+
+
+def test_get_and_set_counts_hits_and_misses():
+    query_cache = create_query_cache(max_size=10, ttl_seconds=60)
+    hits, misses = get_cache_requests("hit"), get_cache_requests("miss")
+
+    assert query_cache.get("Title", "Abstract") is None
+    query_cache.set("Title", "Abstract", make_cached_query(1.0))
+    cached_query = query_cache.get("title", "abstract")
+
+    assert cached_query.ids == ["id-1", "id-2"]
+    assert query_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+    assert get_cache_requests("hit") == hits + 1
+    assert get_cache_requests("miss") == misses + 1
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_size=2, ttl_seconds=60)
+    backend.set("a", make_cached_query(1.0))
+    backend.set("b", make_cached_query(2.0))
+    backend.get("a")
+    backend.set("c", make_cached_query(3.0))
+
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.get("c") is not None
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend(max_size=2, ttl_seconds=60)
+    with patch("src.services.query_cache.time.monotonic", return_value=0):
+        backend.set("a", make_cached_query(1.0))
+
+    with patch("src.services.query_cache.time.monotonic", return_value=61):
+        assert backend.get("a") is None
+    assert backend.size() == 0
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache" / "query_cache.db")
+    writer = SqliteCacheBackend(path, max_size=10, ttl_seconds=60)
+    reader = SqliteCacheBackend(path, max_size=10, ttl_seconds=60)
+
+    writer.set("a", make_cached_query(1.0))
+    cached_query = reader.get("a")
+
+    assert cached_query.embedding.tolist() == [[1.0, 1.0]]
+    assert cached_query.scores == [0.9, 0.8]
+    assert reader.size() == 1
+
+
+def test_sqlite_backend_expires_and_trims_entries(tmp_path):
+    backend = SqliteCacheBackend(str(tmp_path / "query_cache.db"), max_size=2, ttl_seconds=60)
+    backend.EVICTION_INTERVAL = 1
+
+    with patch("src.services.query_cache.time.time", return_value=0):
+        backend.set("expired", make_cached_query(0.0))
+
+    with patch("src.services.query_cache.time.time", return_value=100):
+        for key in ["a", "b", "c"]:
+            backend.set(key, make_cached_query(1.0))
+        assert backend.get("expired") is None
+
+    assert backend.size() == 2
+
+
+@pytest.mark.parametrize("path, backend_type", [
+    (None, MemoryCacheBackend),
+    ("query_cache.db", SqliteCacheBackend)
+])
+def test_create_query_cache(tmp_path, path, backend_type):
+    query_cache = create_query_cache(10, 60, str(tmp_path / path) if path else None)
+    assert isinstance(query_cache.backend, backend_type)
+
+
+def test_sqlite_cache_ignores_entries_of_rebuilt_index(tmp_path):
+    path = str(tmp_path / "query_cache.db")
+    ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(1, 4)]
+    old_cache = create_query_cache(10, 60, path, IdTable.from_ids(ids).get_hash())
+    old_cache.set("Title", "Abstract", make_cached_query(1.0))
+
+    # The rebuilt index holds the same papers in a different row order
+    rebuilt_cache = create_query_cache(10, 60, path, IdTable.from_ids(ids[::-1]).get_hash())
+    same_cache = create_query_cache(10, 60, path, IdTable.from_ids(ids).get_hash())
+
+    assert rebuilt_cache.get("Title", "Abstract") is None
+    assert same_cache.get("Title", "Abstract") is not None
+
+
+def test_sqlite_backend_treats_unreadable_entries_as_misses(tmp_path):
+    path = str(tmp_path / "query_cache.db")
+    backend = SqliteCacheBackend(path, max_size=10, ttl_seconds=60)
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "INSERT INTO query_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            ("a", b"not a pickle", 1e12)
+        )
+
+    assert backend.get("a") is None
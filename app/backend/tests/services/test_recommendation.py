@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+import numpy as np
+from unittest.mock import patch, MagicMock
+from uuid import UUID
+from typing import Generator, List
+from src.services.embedding import EmbeddingService
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.index_search import IndexSearchService
+from src.services.query_cache import create_query_cache
+from src.services.paper_store import PaperStore, write_paper_store
+from src.services.recommendation import RecommendationService
+
+IDS = [UUID(int=i) for i in range(1, 6)]
+SCORES = [0.9, 0.8, 0.7, 0.6, 0.5]
+# Index rows are in reverse order of IDS
+ROWS = [len(IDS) - 1 - i for i in range(len(IDS))]
+
+
+def fake_get_papers_by_ids(db: MagicMock, ids: List[UUID]) -> List[MagicMock]:
+    papers = []
+    for id in ids:
+        paper = MagicMock(id=id, title=f"Paper {id.int}", year=2025, abstract="Abstract")
+        paper.venue.name = "Venue 1"
+        paper.authors = []
+        papers.append(paper)
+    return papers
+
+
+@pytest.fixture
+def recommendation_service() -> Generator[RecommendationService, None, None]:
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.embed_batch.side_effect = lambda titles, _: np.ones((len(titles), 4))
+    embedding_batcher = MagicMock(spec=EmbeddingBatcher)
+    embedding_batcher.embed.return_value = np.ones((1, 4))
+
+    search_service = MagicMock(spec=IndexSearchService)
+    search_service.search.return_value = (IDS, SCORES, ROWS)
+    search_service.search_batch.side_effect = lambda embeddings, _: (
+        [IDS] * len(embeddings),
+        [SCORES] * len(embeddings),
+        [ROWS] * len(embeddings)
+    )
+
+    with patch(
+        "src.services.recommendation.get_papers_by_ids",
+        side_effect=fake_get_papers_by_ids
+    ):
+        yield RecommendationService(
+            embedding_service,
+            search_service,
+            embedding_batcher,
+            create_query_cache(max_size=10, ttl_seconds=60),
+            max_top_k=5
+        )
+
+
+def test_recommend(recommendation_service: RecommendationService):
+    papers = recommendation_service.recommend(MagicMock(), "Title", "Abstract", 3)
+
+    assert [paper["id"] for paper in papers] == [str(id) for id in IDS[:3]]
+    assert [paper["recommendation_score"] for paper in papers] == SCORES[:3]
+    recommendation_service.search_service.search.assert_called_once()
+    assert recommendation_service.search_service.search.call_args[0][1] == 5
+
+
+def test_recommend_cache_hit_skips_inference(recommendation_service: RecommendationService):
+    recommendation_service.recommend(MagicMock(), "Title", "Abstract", 3)
+    papers = recommendation_service.recommend(MagicMock(), " title", "abstract", 5)
+
+    assert [paper["id"] for paper in papers] == [str(id) for id in IDS]
+    recommendation_service.embedding_batcher.embed.assert_called_once()
+    recommendation_service.search_service.search.assert_called_once()
+    assert recommendation_service.query_cache.stats()["hits"] == 1
+
+
+def test_recommend_many(recommendation_service: RecommendationService):
+    recommendation_service.recommend(MagicMock(), "Title 1", "Abstract 1", 3)
+    results = recommendation_service.recommend_many(
+        MagicMock(),
+        ["Title 1", "Title 2", "Title 3"],
+        ["Abstract 1", "Abstract 2", "Abstract 3"],
+        [1, 2, 5]
+    )
+
+    assert [len(papers) for papers in results] == [1, 2, 5]
+    embedded_titles = recommendation_service.embedding_service.embed_batch.call_args[0][0]
+    assert embedded_titles == ["Title 2", "Title 3"]
+    recommendation_service.search_service.search_batch.assert_called_once()
+
+
+def test_recommend_from_paper_store(
+    recommendation_service: RecommendationService,
+    tmp_path
+):
+    # Store rows follow the index rows, with the third paper missing
+    store_path = str(tmp_path / "papers")
+    records = [
+        {"id": str(id), "title": "Paper", "year": 2025, "abstract": "", "venue": "", "authors": []}
+        for id in reversed(IDS)
+    ]
+    records[2] = None
+    write_paper_store(store_path, records)
+
+    recommendation_service.paper_store = PaperStore(store_path)
+
+    with patch("src.services.recommendation.get_papers_by_ids") as mock_get_papers_by_ids:
+        papers = recommendation_service.recommend(MagicMock(), "Title", "Abstract", 4)
+
+    assert [paper["id"] for paper in papers] == [str(IDS[0]), str(IDS[1]), str(IDS[3])]
+    assert [paper["recommendation_score"] for paper in papers] == [0.9, 0.8, 0.6]
+    mock_get_papers_by_ids.assert_not_called()
+
+
+def test_recommend_from_stale_paper_store(
+    recommendation_service: RecommendationService,
+    tmp_path
+):
+    # The records of the first two papers are swapped, so their rows hold the wrong papers
+    store_path = str(tmp_path / "papers")
+    store_ids = list(reversed(IDS))
+    store_ids[3], store_ids[4] = store_ids[4], store_ids[3]
+    write_paper_store(store_path, [
+        {"id": str(id), "title": "Paper", "year": 2025, "abstract": "", "venue": "", "authors": []}
+        for id in store_ids
+    ])
+    recommendation_service.paper_store = PaperStore(store_path)
+
+    with patch(
+        "src.services.recommendation.get_papers_by_ids",
+        side_effect=fake_get_papers_by_ids
+    ) as mock_get_papers_by_ids:
+        papers = recommendation_service.recommend(MagicMock(), "Title", "Abstract", 3)
+
+    assert [paper["id"] for paper in papers] == [str(id) for id in IDS[:3]]
+    assert [paper["title"] for paper in papers] == ["Paper 1", "Paper 2", "Paper"]
+    assert set(mock_get_papers_by_ids.call_args[0][1]) == set(IDS[:2])
+
+
+def test_hydrate_async(recommendation_service: RecommendationService):
+    results = recommendation_service.search_many(["Title 1", "Title 2"], ["Abstract"] * 2, [2, 3])
+
+    with patch(
+        "src.services.recommendation.get_papers_by_ids_async",
+        side_effect=fake_get_papers_by_ids
+    ) as mock_get_papers_by_ids_async:
+        papers_per_query = asyncio.run(recommendation_service.hydrate_async(MagicMock(), results))
+
+    assert [[paper["id"] for paper in papers] for papers in papers_per_query] == [
+        [str(id) for id in IDS[:2]],
+        [str(id) for id in IDS[:3]]
+    ]
+    mock_get_papers_by_ids_async.assert_called_once()
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import torch
+from transformers import BertConfig, BertModel, BertTokenizerFast
+from src.services.text_encoder import (
+    TorchTextEncoder,
+    OnnxTextEncoder,
+    create_text_encoder,
+    TORCH_BACKEND
+)
+from src.services.pooling import MEAN_POOLING, CLS_POOLING
+from src.utils.export_onnx import export_onnx
+
+TEXTS = ["w1 w2 a b", "w3 w4 w5 w6 w7 w8 c d e f", "x"]
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory: pytest.TempPathFactory) -> str:
+    model_dir = tmp_path_factory.mktemp("model")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + [f"w{i}" for i in range(10)]
+    vocab += list("abcdefghijklmnopqrstuvwxyz")
+    (model_dir / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(str(model_dir / "vocab.txt")).save_pretrained(str(model_dir))
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64
+    )
+    BertModel(config).save_pretrained(str(model_dir))
+    return str(model_dir)
+
+
+@pytest.fixture(scope="module")
+def torch_encoder(model_dir: str) -> TorchTextEncoder:
+    return TorchTextEncoder(model_dir, 512, MEAN_POOLING)
+
+
+def test_torch_encoder_ignores_padding(torch_encoder: TorchTextEncoder):
+    batch_embeddings = torch_encoder.encode(TEXTS)
+    single_embeddings = np.vstack([torch_encoder.encode([text]) for text in TEXTS])
+
+    assert batch_embeddings.shape == (3, 32)
+    assert batch_embeddings.dtype == np.float32
+    np.testing.assert_allclose(batch_embeddings, single_embeddings, atol=1e-5)
+
+
+def test_cls_pooling_ignores_padding(model_dir: str):
+    cls_encoder = TorchTextEncoder(model_dir, 512, CLS_POOLING)
+
+    batch_embeddings = cls_encoder.encode(TEXTS)
+    single_embeddings = np.vstack([cls_encoder.encode([text]) for text in TEXTS])
+
+    np.testing.assert_allclose(batch_embeddings, single_embeddings, atol=1e-5)
+
+
+def test_onnx_encoder_matches_torch(model_dir: str, torch_encoder: TorchTextEncoder, tmp_path):
+    onnx_path = str(tmp_path / "model.onnx")
+    export_onnx(model_dir, onnx_path)
+
+    onnx_encoder = OnnxTextEncoder(model_dir, 512, MEAN_POOLING, onnx_path)
+
+    np.testing.assert_allclose(onnx_encoder.encode(TEXTS), torch_encoder.encode(TEXTS), atol=1e-4)
+
+
+def test_quantized_onnx_encoder(model_dir: str, torch_encoder: TorchTextEncoder, tmp_path):
+    onnx_path = str(tmp_path / "model.quant.onnx")
+    export_onnx(model_dir, onnx_path, quantize=True)
+
+    onnx_embeddings = OnnxTextEncoder(model_dir, 512, MEAN_POOLING, onnx_path).encode(TEXTS)
+    torch_embeddings = torch_encoder.encode(TEXTS)
+
+    similarities = (onnx_embeddings * torch_embeddings).sum(axis=1) / (
+        np.linalg.norm(onnx_embeddings, axis=1) * np.linalg.norm(torch_embeddings, axis=1)
+    )
+    assert similarities.min() > 0.99
+    assert list(tmp_path.iterdir()) == [tmp_path / "model.quant.onnx"]
+
+
+def test_create_text_encoder(model_dir: str):
+    text_encoder = create_text_encoder(TORCH_BACKEND, model_dir, 512, MEAN_POOLING, "")
+    assert isinstance(text_encoder, TorchTextEncoder)
+
+    with pytest.raises(ValueError, match="Unknown text encoder backend"):
+        create_text_encoder("tensorrt", model_dir, 512, MEAN_POOLING, "")
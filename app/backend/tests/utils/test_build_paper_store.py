@@ -0,0 +1,69 @@
+import pickle
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, Session
+from uuid import UUID
+from typing import Generator
+from src.models.base import Base
+from src.models import Paper, Venue, Author
+from src.services.paper_store import PaperStore
+from src.utils.build_paper_store import build_paper_store
+
+PAPER_ID_1 = "0abc9de7-e047-44fc-998d-4bf02b9bc9ab"
+PAPER_ID_2 = "3b2a5324-7b66-4101-9982-3a26e82afa3d"
+MISSING_PAPER_ID = "010d4ce9-0279-4166-ae73-14551ded6404"
+
+
+@pytest.fixture
+def fake_db() -> Generator[Session, None, None]:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    venue = Venue(name="Venue 1")
+    author = Author(first_name="John", last_name="Doe")
+    db.add_all([
+        Paper(
+            id=UUID(PAPER_ID_1),
+            title="Paper 1",
+            year=2025,
+            abstract="Abstract for paper 1",
+            venue=venue,
+            authors=[author]
+        ),
+        Paper(
+            id=UUID(PAPER_ID_2),
+            title="Paper 2",
+            year=2024,
+            abstract="Abstract for paper 2",
+            venue=venue,
+            authors=[]
+        )
+    ])
+    db.commit()
+
+    yield db
+    db.close()
+
+
+def test_build_paper_store(fake_db: Session, tmp_path):
+    ids_path = tmp_path / "ids.pkl"
+    ids_path.write_bytes(pickle.dumps([PAPER_ID_2, MISSING_PAPER_ID, PAPER_ID_1]))
+    store_path = str(tmp_path / "papers")
+
+    build_paper_store(fake_db, str(ids_path), store_path)
+
+    paper_store = PaperStore(store_path)
+    assert len(paper_store) == 3
+    assert paper_store.get_paper(0)["title"] == "Paper 2"
+    assert paper_store.get_paper(1) is None
+    assert paper_store.get_paper(2) == {
+        "id": PAPER_ID_1,
+        "title": "Paper 1",
+        "year": 2025,
+        "abstract": "Abstract for paper 1",
+        "venue": "Venue 1",
+        "authors": [{"first_name": "John", "last_name": "Doe"}]
+    }
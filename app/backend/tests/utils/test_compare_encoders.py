@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from uuid import UUID
+from src.services.embedding import EmbeddingService
+from src.services.index_search import IndexSearchService
+from src.services.text_encoder import TextEncoder
+from src.utils.compare_encoders import (
+    compute_cosine_similarities,
+    compute_overlap_at_k,
+    compute_precision_at_k,
+    run_encoder
+)
+
+IDS = [UUID(int=i) for i in range(1, 5)]
+
+
+def test_compute_cosine_similarities():
+    reference = np.array([[1.0, 0.0], [1.0, 1.0]])
+    candidate = np.array([[2.0, 0.0], [1.0, -1.0]])
+
+    np.testing.assert_allclose(compute_cosine_similarities(reference, candidate), [1.0, 0.0])
+
+
+def test_compute_overlap_at_k():
+    reference_ids = [["a", "b", "c", "d"], ["e", "f"]]
+    candidate_ids = [["a", "c", "x", "y"], ["f", "e"]]
+
+    assert compute_overlap_at_k(reference_ids, candidate_ids) == pytest.approx(0.75)
+
+
+def test_compute_precision_at_k():
+    # Papers without references are skipped
+    recommended_ids = [IDS[:2], IDS[2:], IDS[:2]]
+    references = [[str(IDS[0])], [str(IDS[2]), str(IDS[3])], []]
+
+    assert compute_precision_at_k(recommended_ids, references) == pytest.approx(0.75)
+
+
+def test_run_encoder_leaves_service_encoder():
+    text_encoder = MagicMock(spec=TextEncoder)
+    text_encoder.encode.side_effect = lambda texts: np.ones((len(texts), 4))
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.text_encoder = MagicMock(spec=TextEncoder)
+    embedding_service.fuse.side_effect = lambda embeddings: embeddings
+    search_service = MagicMock(spec=IndexSearchService)
+    search_service.search_batch.side_effect = lambda embeddings, _: (
+        [IDS] * len(embeddings), None, None
+    )
+
+    text_embeddings, ids = run_encoder(
+        text_encoder, embedding_service, search_service, ["Title"] * 3, ["Abstract"] * 3, 4
+    )
+
+    assert text_embeddings.shape == (3, 4)
+    assert ids == [IDS] * 3
+    assert text_encoder.encode.call_args[0][0] == ["Title Abstract"] * 3
+    embedding_service.text_encoder.encode.assert_not_called()
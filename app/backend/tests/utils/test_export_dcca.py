@@ -0,0 +1,71 @@
+import os
+import pytest
+import numpy as np
+from mvlearn.embed import DCCA
+from unittest.mock import patch
+from src.utils.export_dcca import export_dcca
+from src.services.projection import DccaProjector
+
+
+@pytest.fixture(scope="module")
+def dcca(tmp_path_factory: pytest.TempPathFactory) -> DCCA:
+    rng = np.random.default_rng(0)
+    text_embeddings = rng.normal(size=(200, 12))
+    node_embeddings = rng.normal(size=(200, 6))
+
+    dcca = DCCA(
+        input_size1=12,
+        input_size2=6,
+        n_components=4,
+        layer_sizes1=[10, 4],
+        layer_sizes2=[4],
+        epoch_num=1,
+        batch_size=64
+    )
+    # DCCA.fit writes a checkpoint to the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("dcca"))
+    try:
+        with pytest.warns(Warning):
+            dcca.fit([text_embeddings, node_embeddings])
+    finally:
+        os.chdir(cwd)
+    return dcca
+
+
+def test_projection_matches_dcca_transform(dcca: DCCA, tmp_path):
+    weights_path = str(tmp_path / "dcca.npz")
+    with patch("src.utils.export_dcca.read_obj", return_value=dcca):
+        export_dcca("fake_path", weights_path)
+
+    projector = DccaProjector(weights_path)
+    rng = np.random.default_rng(1)
+    text_embeddings = rng.normal(size=(8, 12))
+    node_embeddings = rng.normal(size=(8, 6))
+
+    expected_text, expected_node = dcca.transform([text_embeddings, node_embeddings])
+    text_projections, node_projections = projector.project(text_embeddings, node_embeddings)
+
+    np.testing.assert_allclose(text_projections, expected_text, rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(node_projections, expected_node, rtol=1e-7, atol=1e-9)
+
+
+def test_projection_single_row(dcca: DCCA, tmp_path):
+    weights_path = str(tmp_path / "dcca.npz")
+    with patch("src.utils.export_dcca.read_obj", return_value=dcca):
+        export_dcca("fake_path", weights_path)
+
+    projector = DccaProjector(weights_path)
+    rng = np.random.default_rng(2)
+    text_embedding = rng.normal(size=(1, 12))
+    node_embedding = rng.normal(size=(1, 6))
+
+    # DCCA.transform cannot handle a single row, so compare against a duplicated one
+    expected = dcca.transform([
+        np.vstack([text_embedding, text_embedding]),
+        np.vstack([node_embedding, node_embedding])
+    ])
+    text_projection, node_projection = projector.project(text_embedding, node_embedding)
+
+    np.testing.assert_allclose(text_projection, expected[0][:1], rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(node_projection, expected[1][:1], rtol=1e-7, atol=1e-9)
@@ -1,7 +1,9 @@
 import faiss
+import json
 import pickle
+import numpy as np
 from unittest.mock import patch, mock_open
-from src.utils.file_utils import read_embeddings, read_obj
+from src.utils.file_utils import read_embeddings, read_obj, iter_papers
 
 
 def test_read_embeddings():
@@ -13,6 +15,23 @@ def test_read_embeddings():
         assert result == mock_index
 
 
+def test_read_embeddings_mmap(tmp_path):
+    index = faiss.IndexFlatIP(4)
+    index.add(np.eye(4, dtype=np.float32))
+    index_path = str(tmp_path / "index.faiss")
+    faiss.write_index(index, index_path)
+
+    with patch.object(faiss, "read_index", wraps=faiss.read_index) as mock_read_index:
+        result = read_embeddings(index_path, mmap=True)
+        mock_read_index.assert_called_once_with(
+            index_path,
+            faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+        )
+
+    assert result.ntotal == 4
+    assert result.reconstruct(2).tolist() == [0.0, 0.0, 1.0, 0.0]
+
+
 def test_read_obj():
     dummy_data = {"key": "value"}
 
@@ -21,3 +40,15 @@ def test_read_obj():
             result = read_obj("fake_path")
             mock_pickle_load.assert_called_once()
             assert result == dummy_data
+
+
+def test_iter_papers(tmp_path):
+    papers = [{"id": "1", "title": "Paper [1]"}, {"id": "2", "title": "Paper 2"}]
+    papers_path = tmp_path / "papers.json"
+    lines = ",\n".join(json.dumps(paper) for paper in papers)
+    papers_path.write_text(f"[\n{lines}\n]")
+
+    result = iter_papers(str(papers_path))
+
+    assert next(result) == papers[0]
+    assert list(result) == papers[1:]
@@ -0,0 +1,43 @@
+import pickle
+import numpy as np
+from uuid import UUID
+from src.utils.id_table import IdTable, read_ids, save_ids
+from src.utils.convert_ids import convert_ids
+
+IDS = [str(UUID(int=i)) for i in (7, 3, 2 ** 127, 5)]
+
+
+def test_id_table():
+    id_table = IdTable.from_ids(IDS)
+
+    assert len(id_table) == 4
+    assert id_table.ids.shape == (4, 16)
+    assert id_table.get_uuid(2) == UUID(IDS[2])
+    assert id_table.get_uuids([3, 0]) == [UUID(IDS[3]), UUID(IDS[0])]
+
+
+def test_id_table_align():
+    id_table = IdTable.from_ids(IDS)
+    other = IdTable.from_ids([IDS[3], IDS[0], IDS[2]])
+
+    assert id_table.align(other).tolist() == [3, 0, 2]
+
+
+def test_read_ids_npy(tmp_path):
+    ids_path = str(tmp_path / "ids.npy")
+    save_ids(ids_path, IdTable.from_ids(IDS))
+
+    id_table = read_ids(ids_path, mmap=True)
+
+    assert isinstance(id_table.ids, np.memmap)
+    assert id_table.get_uuids(range(4)) == [UUID(id) for id in IDS]
+
+
+def test_convert_ids(tmp_path):
+    pkl_path = tmp_path / "ids.pkl"
+    pkl_path.write_bytes(pickle.dumps(IDS))
+    npy_path = str(tmp_path / "ids.npy")
+
+    convert_ids(str(pkl_path), npy_path)
+
+    assert read_ids(npy_path).get_uuids(range(4)) == read_ids(str(pkl_path)).get_uuids(range(4))
@@ -0,0 +1,19 @@
+from unittest.mock import patch, mock_open
+from src.utils.memory_utils import get_memory_usage_mb
+
+
+def test_get_memory_usage_mb():
+    with patch("builtins.open", mock_open(read_data="1000 512 256 10 0 300 0")), \
+            patch("os.sysconf", return_value=4096):
+        resident_mb, shared_mb = get_memory_usage_mb()
+
+    assert resident_mb == 2.0
+    assert shared_mb == 1.0
+
+
+def test_get_memory_usage_mb_without_proc():
+    with patch("builtins.open", side_effect=OSError):
+        resident_mb, shared_mb = get_memory_usage_mb()
+
+    assert resident_mb > 0
+    assert shared_mb == 0.0
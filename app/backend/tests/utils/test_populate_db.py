@@ -0,0 +1,111 @@
+import json
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker, Session
+from uuid import UUID
+from typing import Any, Dict, Generator, List
+from src.models.base import Base
+from src.models import Paper, Venue, Author, PaperAuthor, Citation
+from src.utils.populate_db import populate_db_bulk, split_author_name
+
+PAPER_ID_1 = "0abc9de7-e047-44fc-998d-4bf02b9bc9ab"
+PAPER_ID_2 = "3b2a5324-7b66-4101-9982-3a26e82afa3d"
+MISSING_PAPER_ID = "010d4ce9-0279-4166-ae73-14551ded6404"
+
+
+@pytest.fixture
+def fake_db() -> Generator[Session, None, None]:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def papers_data() -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": PAPER_ID_1,
+            "title": "Paper 1",
+            "year": 2025,
+            "abstract": "Abstract for paper 1",
+            "venue": "Venue 1",
+            "authors": ["John Doe", "Jane Smith"],
+            "references": [PAPER_ID_2, MISSING_PAPER_ID]
+        },
+        {
+            "id": PAPER_ID_2,
+            "title": "Paper 2",
+            "year": 2024,
+            "abstract": "Abstract for paper 2",
+            "venue": "Venue 1",
+            "authors": ["John Doe", "Plato"],
+            "references": []
+        },
+        {
+            "id": PAPER_ID_2,
+            "title": "Paper 2 duplicate",
+            "year": 2024,
+            "abstract": "Abstract for paper 2",
+            "venue": "Venue 2",
+            "authors": ["John Doe"],
+            "references": [PAPER_ID_1]
+        }
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path: Path, papers_data: List[Dict[str, Any]]) -> str:
+    path = tmp_path / "papers.json"
+    lines = ",\n".join(json.dumps(paper_data) for paper_data in papers_data)
+    path.write_text(f"[\n{lines}\n]")
+    return str(path)
+
+
+def count_rows(db: Session, model: Any) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_split_author_name():
+    assert split_author_name("John Doe") == ("John", "Doe")
+    assert split_author_name("Jean Paul Sartre") == ("Jean", "Paul Sartre")
+    assert split_author_name("Plato") == ("Plato", None)
+
+
+def test_populate_db_bulk(fake_db: Session, json_path: str):
+    populate_db_bulk(fake_db, json_path)
+
+    assert count_rows(fake_db, Paper) == 2
+    assert count_rows(fake_db, Venue) == 1
+    assert count_rows(fake_db, Author) == 3
+    assert count_rows(fake_db, PaperAuthor) == 4
+
+    paper = fake_db.get(Paper, UUID(PAPER_ID_1))
+    assert paper.venue.name == "Venue 1"
+    assert sorted(author.first_name for author in paper.authors) == ["Jane", "John"]
+
+    citations = {
+        (str(citation.citing_paper_id), str(citation.cited_paper_id))
+        for citation in fake_db.scalars(select(Citation))
+    }
+    assert citations == {(PAPER_ID_1, PAPER_ID_2), (PAPER_ID_2, PAPER_ID_1)}
+
+
+def test_populate_db_bulk_reuses_existing_rows(fake_db: Session, json_path: str):
+    author = Author(first_name="John", last_name="Doe")
+    fake_db.add(author)
+    fake_db.commit()
+
+    populate_db_bulk(fake_db, json_path)
+    populate_db_bulk(fake_db, json_path)
+
+    assert count_rows(fake_db, Paper) == 2
+    assert count_rows(fake_db, Author) == 3
+    assert count_rows(fake_db, Citation) == 2
+
+    paper = fake_db.get(Paper, UUID(PAPER_ID_2))
+    assert author.id in {paper_author.id for paper_author in paper.authors}
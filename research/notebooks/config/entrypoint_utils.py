@@ -1,21 +1,22 @@
 import os
-import networkx as nx
 import numpy as np
-from typing import List, Union, Dict, Callable
+from typing import List, Union, Dict, Callable, Optional
 from src.models.text.text_vectors import train_tfidf, generate_and_save_text_vectors
 from src.evaluation.evaluate import evaluate
+from src.evaluation.index_benchmark import rebuild_index, benchmark_index
 from src.models.text.text_embeddings import (
     generate_and_save_transformer_embeddings,
     train_doc2vec,
     generate_and_save_doc2vec_embeddings
 )
-from src.models.graph.graph import generate_and_save_graph
+from src.models.graph.graph import generate_and_save_graph, convert_graph
 from src.models.graph.node_embeddings import (
     generate_and_save_train_node_embeddings,
     generate_and_save_test_node_embeddings
 )
 from src.models.fusion.fusion import train_fusion_model, project_embeddings, fuse_embeddings
 from src.models.rerank.rerank import compute_and_save_rerank_scores
+from src.data_models.citation_graph import CitationGraph
 
 
 def run_train_tfidf(curr_dir: str, dataset: str) -> None:
@@ -138,11 +139,18 @@ def run_generate_and_save_doc2vec_embeddings(curr_dir: str, dataset: str) -> Non
 
 def run_generate_and_save_graph(curr_dir: str, dataset: str) -> None:
     generate_and_save_graph(
-        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.pkl"),
+        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.npz"),
         train_papers_path=os.path.join(curr_dir, f"data/parsed/{dataset}_train.json")
     )
 
 
+def run_convert_graph(curr_dir: str, dataset: str) -> None:
+    convert_graph(
+        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.npz"),
+        pickle_graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.pkl")
+    )
+
+
 def run_generate_and_save_train_node_embeddings(
     curr_dir: str,
     dataset: str,
@@ -154,7 +162,7 @@ def run_generate_and_save_train_node_embeddings(
     generate_and_save_train_node_embeddings(
         index_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_{model}.faiss"),
         ids_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_{model}_ids.pkl"),
-        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.pkl"),
+        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.npz"),
         p=p,
         q=q
     )
@@ -416,13 +424,46 @@ def run_compute_and_save_rerank_scores(
     curr_dir: str,
     dataset: str,
     model: str,
-    rerank_func: Callable[[nx.DiGraph], Dict[str, float]]
+    rerank_func: Callable[[CitationGraph, Optional[Dict[str, float]]], Dict[str, float]],
+    warm_start: bool = False
 ) -> None:
     compute_and_save_rerank_scores(
         rerank_scores_path=os.path.join(
             curr_dir,
             f"data/embeddings/{dataset}_train_graph_{model}.pkl"
         ),
-        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.pkl"),
-        rerank_func=rerank_func
+        graph_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_graph.npz"),
+        rerank_func=rerank_func,
+        warm_start=warm_start
+    )
+
+
+def run_rebuild_index(curr_dir: str, dataset: str, model: str, index_type: str) -> None:
+    rebuild_index(
+        index_path=os.path.join(
+            curr_dir,
+            f"data/embeddings/{dataset}_train_{model}_{index_type}.faiss"
+        ),
+        flat_index_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_{model}.faiss"),
+        index_type=index_type
+    )
+
+
+def run_benchmark_index(
+    curr_dir: str,
+    dataset: str,
+    model: str,
+    test_model: str,
+    index_types: List[str],
+    k: int
+) -> None:
+    benchmark_index(
+        results_path=os.path.join(curr_dir, f"data/results/index/{dataset}_{model}_results.csv"),
+        flat_index_path=os.path.join(curr_dir, f"data/embeddings/{dataset}_train_{model}.faiss"),
+        query_index_path=os.path.join(
+            curr_dir,
+            f"data/embeddings/{dataset}_test_{test_model}.faiss"
+        ),
+        index_types=index_types,
+        k=k
     )
@@ -11,6 +11,12 @@ MIN_DOC_FREQ = 5
 
 BERT_MAX_TOKENS = 512
 TEXT_EMBEDDING_BATCH_SIZE = 32
+# Token pooling, "mean" or "cls", must match TEXT_POOLING in the backend
+TEXT_POOLING = "mean"
+# Papers per on-disk embedding shard, the unit of checkpointing and resume
+EMBEDDING_SHARD_SIZE = 50000
+# CPU processes embedding shards in parallel, each with its own model and share of cores
+EMBEDDING_NUM_PROCESSES = 1
 DOC2VEC_DIM = 300
 DOC2VEC_WINDOW = 5
 
@@ -18,9 +24,13 @@ DOC2VEC_WINDOW = 5
 NODE2VEC_DIM = 128
 NODE2VEC_WALK_LEN = 80
 NODE2VEC_NUM_WALKS = 200
+# Walks generated together in one vectorised batch
+NODE2VEC_WALK_CHUNK_SIZE = 10000
 WORD2VEC_WINDOW = 10
 WORD2VEC_MIN_COUNT = 1
 WORD2VEC_BATCH_WORDS = 4
+# Test papers searched at once when averaging neighbour node embeddings
+TEST_NODE_BATCH_SIZE = 1024
 
 # Fusion constants
 CCA_DIM = 128
@@ -32,6 +42,28 @@ DCCA_BATCH_SIZE = 256
 
 # Rerank constants
 PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 100
+PAGERANK_TOLERANCE = 1.0e-6
 
 HITS_MAX_ITER = 100
 HITS_TOLERANCE = 1.0e-8
+
+# Index constants
+FLAT_INDEX = "flat"
+IVF_FLAT_INDEX = "ivf_flat"
+IVF_PQ_INDEX = "ivf_pq"
+HNSW_INDEX = "hnsw"
+
+FAISS_IVF_NLIST = 4096
+FAISS_IVF_MIN_POINTS_PER_CENTROID = 39
+FAISS_PQ_M = 32
+FAISS_PQ_NBITS = 8
+FAISS_HNSW_M = 32
+FAISS_HNSW_EF_CONSTRUCTION = 200
+# Bounds on memory when building indexes from shards and extracting their vectors
+FAISS_MAX_TRAIN_POINTS = 256 * FAISS_IVF_NLIST
+FAISS_ADD_BATCH_SIZE = 100000
+FAISS_RECONSTRUCT_BATCH_SIZE = 100000
+
+FAISS_NPROBE_VALS = [1, 4, 16, 64, 256]
+FAISS_EF_SEARCH_VALS = [16, 32, 64, 128, 256]
@@ -0,0 +1,20 @@
+import numpy as np
+import scipy.sparse as sp
+from dataclasses import dataclass
+
+
+@dataclass
+class CitationGraph:
+    # Row i of 'out_adjacency' holds the papers cited by node i, row i of 'in_adjacency'
+    # the papers citing it. Node i is the paper with ID 'node_ids[i]'
+    node_ids: np.ndarray
+    out_adjacency: sp.csr_matrix
+    in_adjacency: sp.csr_matrix
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return self.out_adjacency.nnz
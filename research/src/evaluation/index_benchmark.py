@@ -0,0 +1,96 @@
+import time
+import faiss
+import numpy as np
+from typing import List, Dict, Tuple
+from src.utils.file_utils import read_embeddings, save_results
+from src.utils.index_utils import build_index, set_search_parameters
+from src.utils.preprocess_utils import extract_embeddings_from_index
+from src.config.settings import (
+    IVF_FLAT_INDEX,
+    IVF_PQ_INDEX,
+    HNSW_INDEX,
+    FAISS_NPROBE_VALS,
+    FAISS_EF_SEARCH_VALS
+)
+
+
+def rebuild_index(index_path: str, flat_index_path: str, index_type: str) -> None:
+    flat_index = read_embeddings(flat_index_path)
+    embeddings = extract_embeddings_from_index(flat_index)
+
+    print(f"Saving {index_type} index of {len(embeddings)} embeddings of dim {embeddings.shape[1]}")
+    index = build_index(embeddings, index_type)
+    faiss.write_index(index, index_path)
+
+
+def benchmark_index(
+    results_path: str,
+    flat_index_path: str,
+    query_index_path: str,
+    index_types: List[str],
+    k: int
+) -> None:
+    flat_index = read_embeddings(flat_index_path)
+    embeddings = extract_embeddings_from_index(flat_index)
+    queries = extract_embeddings_from_index(read_embeddings(query_index_path))
+
+    # Exact neighbours from the flat index are the ground truth
+    exact_latency_ms, exact_indices = time_search(flat_index, queries, k)
+
+    results: Dict[str, List] = {
+        "Index": ["flat"],
+        "Param": [""],
+        "Build (s)": [0.0],
+        f"Recall@{k}": [1.0],
+        "Latency (ms)": [round(exact_latency_ms, 4)]
+    }
+
+    for index_type in index_types:
+        start = time.perf_counter()
+        index = build_index(embeddings, index_type)
+        build_seconds = time.perf_counter() - start
+
+        if index_type in (IVF_FLAT_INDEX, IVF_PQ_INDEX):
+            params = [("nprobe", nprobe) for nprobe in FAISS_NPROBE_VALS]
+        elif index_type == HNSW_INDEX:
+            params = [("efSearch", ef_search) for ef_search in FAISS_EF_SEARCH_VALS]
+        else:
+            params = [("", 0)]
+
+        for name, value in params:
+            set_search_parameters(index, nprobe=value, ef_search=value)
+            latency_ms, indices = time_search(index, queries, k)
+            recall = compute_recall(indices, exact_indices)
+
+            print(
+                f"{index_type} {name}={value}: recall@{k}={recall:.4f}, " +
+                f"latency={latency_ms:.4f} ms/query"
+            )
+            results["Index"].append(index_type)
+            results["Param"].append(f"{name}={value}" if name else "")
+            results["Build (s)"].append(round(build_seconds, 2))
+            results[f"Recall@{k}"].append(round(recall, 4))
+            results["Latency (ms)"].append(round(latency_ms, 4))
+
+    print("Saving results")
+    save_results(results_path, results)
+
+
+def time_search(index: faiss.Index, queries: np.ndarray, k: int) -> Tuple[float, np.ndarray]:
+    # Search one query at a time to match the serving path
+    indices = np.empty((len(queries), k), dtype=np.int64)
+
+    start = time.perf_counter()
+    for i in range(len(queries)):
+        _, indices[i:i + 1] = index.search(queries[i:i + 1], k)
+    latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    return latency_ms, indices
+
+
+def compute_recall(indices: np.ndarray, exact_indices: np.ndarray) -> float:
+    hits = sum(
+        len(np.intersect1d(row, exact_row))
+        for row, exact_row in zip(indices, exact_indices)
+    )
+    return hits / exact_indices.size
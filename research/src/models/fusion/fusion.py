@@ -3,13 +3,18 @@ import torch
 from mvlearn.embed import CCA, DCCA
 from typing import Callable, List, Union
 from src.utils.file_utils import read_embeddings, save_embeddings, read_obj, save_obj
-from src.utils.preprocess_utils import extract_embeddings_from_index, align_embeddings
+from src.utils.preprocess_utils import (
+    extract_embeddings_from_index,
+    align_embeddings,
+    get_alignment_cache_path
+)
 from src.config.settings import (
     CCA_DIM,
     DCCA_TEXT_HIDDEN_LAYERS,
     DCCA_NODE_HIDDEN_LAYERS,
     DCCA_EPOCHS,
-    DCCA_BATCH_SIZE
+    DCCA_BATCH_SIZE,
+    FLAT_INDEX
 )
 
 
@@ -21,9 +26,9 @@ def train_fusion_model(
     node_index_path: str,
     node_ids_path: str,
 ) -> None:
-    text_index = read_embeddings(text_index_path)
+    text_index = read_embeddings(text_index_path, mmap=True)
     text_ids: List[str] = read_obj(text_ids_path)
-    node_index = read_embeddings(node_index_path)
+    node_index = read_embeddings(node_index_path, mmap=True)
     node_ids: List[str] = read_obj(node_ids_path)
 
     text_embeddings = extract_embeddings_from_index(text_index)
@@ -32,7 +37,8 @@ def train_fusion_model(
     aligned_node_embeddings, _ = align_embeddings(
         text_ids,
         node_embeddings,
-        node_ids
+        node_ids,
+        get_alignment_cache_path(text_ids_path, node_ids_path)
     )
     fusion_func(fusion_model_path, text_embeddings, aligned_node_embeddings)
 
@@ -77,9 +83,9 @@ def project_embeddings(
     node_ids_path: str
 ) -> None:
     fusion_model: Union[CCA, DCCA] = read_obj(fusion_model_path)
-    text_index = read_embeddings(text_index_path)
+    text_index = read_embeddings(text_index_path, mmap=True)
     text_ids: List[str] = read_obj(text_ids_path)
-    node_index = read_embeddings(node_index_path)
+    node_index = read_embeddings(node_index_path, mmap=True)
     node_ids: List[str] = read_obj(node_ids_path)
 
     text_embeddings = extract_embeddings_from_index(text_index)
@@ -111,11 +117,12 @@ def fuse_embeddings(
     text_index_path: str,
     text_ids_path: str,
     node_index_path: str,
-    node_ids_path: str
+    node_ids_path: str,
+    index_type: str = FLAT_INDEX
 ) -> None:
-    text_index = read_embeddings(text_index_path)
+    text_index = read_embeddings(text_index_path, mmap=True)
     text_ids: List[str] = read_obj(text_ids_path)
-    node_index = read_embeddings(node_index_path)
+    node_index = read_embeddings(node_index_path, mmap=True)
     node_ids: List[str] = read_obj(node_ids_path)
 
     text_embeddings = extract_embeddings_from_index(text_index)
@@ -124,12 +131,13 @@ def fuse_embeddings(
     aligned_node_embeddings, _ = align_embeddings(
         text_ids,
         node_embeddings,
-        node_ids
+        node_ids,
+        get_alignment_cache_path(text_ids_path, node_ids_path)
     )
 
     fused_embeddings = fusion_func(text_embeddings, aligned_node_embeddings)
     print(f"Saving {len(fused_embeddings)} fused embeddings of dim {fused_embeddings.shape[1]}")
-    save_embeddings(fused_index_path, fused_embeddings)
+    save_embeddings(fused_index_path, fused_embeddings, index_type)
     save_obj(fused_ids_path, text_ids)
 
 
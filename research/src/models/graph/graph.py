@@ -1,28 +1,69 @@
 import networkx as nx
-from typing import List
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, List
 from src.data_models.paper import Paper
-from src.utils.file_utils import read_papers, save_obj
+from src.data_models.citation_graph import CitationGraph
+from src.utils.file_utils import read_papers, read_obj, save_graph
 
 
 def generate_and_save_graph(graph_path: str, train_papers_path: str) -> None:
     train_papers = read_papers(train_papers_path)
     graph = generate_graph(train_papers)
 
-    num_nodes = graph.number_of_nodes()
-    num_edges = graph.number_of_edges()
-    print(f"Saving training graph with {num_nodes} nodes and {num_edges} edges")
-    save_obj(graph_path, graph)
+    print(f"Saving training graph with {graph.num_nodes} nodes and {graph.num_edges} edges")
+    save_graph(graph_path, graph)
 
 
-def generate_graph(papers: List[Paper]) -> nx.DiGraph:
-    graph = nx.DiGraph()
+def generate_graph(papers: List[Paper]) -> CitationGraph:
+    # Nodes are numbered in order of first appearance, as networkx orders DiGraph nodes
+    id_to_idx: Dict[str, int] = {}
+    sources = []
+    targets = []
 
     for paper in papers:
-        paper_id = paper.id
-        references = paper.references
+        paper_idx = id_to_idx.setdefault(paper.id, len(id_to_idx))
+        for ref_id in paper.references:
+            sources.append(paper_idx)
+            targets.append(id_to_idx.setdefault(ref_id, len(id_to_idx)))
 
-        graph.add_node(paper_id)
-        for ref_id in references:
-            graph.add_edge(paper_id, ref_id)
+    return create_graph(
+        list(id_to_idx),
+        np.array(sources, dtype=np.int64),
+        np.array(targets, dtype=np.int64)
+    )
 
-    return graph
+
+def create_graph(node_ids: List[str], sources: np.ndarray, targets: np.ndarray) -> CitationGraph:
+    num_nodes = len(node_ids)
+    out_adjacency = sp.csr_matrix(
+        (np.ones(len(sources), dtype=np.int8), (sources, targets)),
+        shape=(num_nodes, num_nodes)
+    )
+    # Repeated citations are a single edge
+    out_adjacency.sum_duplicates()
+    out_adjacency.data[:] = 1
+    out_adjacency.sort_indices()
+
+    in_adjacency = out_adjacency.transpose().tocsr()
+    in_adjacency.sort_indices()
+    return CitationGraph(np.array(node_ids, dtype=str), out_adjacency, in_adjacency)
+
+
+def convert_graph(graph_path: str, pickle_graph_path: str) -> None:
+    # Converts a pickled networkx graph from earlier runs, keeping its node order
+    nx_graph: nx.DiGraph = read_obj(pickle_graph_path)
+    graph = from_networkx(nx_graph)
+
+    print(f"Saving converted graph with {graph.num_nodes} nodes and {graph.num_edges} edges")
+    save_graph(graph_path, graph)
+
+
+def from_networkx(nx_graph: nx.DiGraph) -> CitationGraph:
+    node_ids = list(nx_graph.nodes)
+    id_to_idx = {id: idx for idx, id in enumerate(node_ids)}
+    edges = np.array(
+        [(id_to_idx[source], id_to_idx[target]) for source, target in nx_graph.edges],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    return create_graph(node_ids, edges[:, 0], edges[:, 1])
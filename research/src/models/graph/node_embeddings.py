@@ -1,8 +1,10 @@
-import networkx as nx
 import numpy as np
-from node2vec import Node2Vec
+from gensim.models import Word2Vec
 from typing import Tuple, List
-from src.utils.file_utils import read_obj, save_obj, read_embeddings, save_embeddings
+from src.data_models.citation_graph import CitationGraph
+from src.models.graph.random_walks import RandomWalkCorpus
+from src.utils.file_utils import read_obj, save_obj, read_embeddings, save_embeddings, read_graph
+from src.utils.preprocess_utils import extract_embeddings_from_index
 from src.config.settings import (
     NODE2VEC_DIM,
     NODE2VEC_WALK_LEN,
@@ -10,7 +12,8 @@ from src.config.settings import (
     NUM_WORKERS,
     WORD2VEC_WINDOW,
     WORD2VEC_MIN_COUNT,
-    WORD2VEC_BATCH_WORDS
+    WORD2VEC_BATCH_WORDS,
+    TEST_NODE_BATCH_SIZE
 )
 
 
@@ -21,7 +24,7 @@ def generate_and_save_train_node_embeddings(
     p: float,
     q: float
 ) -> None:
-    graph: nx.DiGraph = read_obj(graph_path)
+    graph = read_graph(graph_path)
     embeddings, ids = generate_train_node_embeddings(graph, p, q)
     print(f"Saving {len(embeddings)} training embeddings of dim {embeddings.shape[1]}")
     save_embeddings(index_path, embeddings)
@@ -29,28 +32,34 @@ def generate_and_save_train_node_embeddings(
 
 
 def generate_train_node_embeddings(
-    graph: nx.DiGraph,
+    graph: CitationGraph,
     p: float,
     q: float
 ) -> Tuple[np.ndarray, List[str]]:
-    # Fit Node2vec (or DeepWalk if p=1 and q=1) on the training set
-    node2vec = Node2Vec(
-        graph,
-        dimensions=NODE2VEC_DIM,
-        walk_length=NODE2VEC_WALK_LEN,
+    ids = graph.node_ids.tolist()
+
+    # Fit Node2vec (or DeepWalk if p=1 and q=1) on the training set, streaming the walks
+    walks = RandomWalkCorpus(
+        graph.out_adjacency.indptr,
+        graph.out_adjacency.indices,
+        ids,
         num_walks=NODE2VEC_NUM_WALKS,
-        workers=NUM_WORKERS,
+        walk_length=NODE2VEC_WALK_LEN,
         p=p,
-        q=q
+        q=q,
+        num_workers=NUM_WORKERS
     )
 
-    word2vec = node2vec.fit(
+    word2vec = Word2Vec(
+        walks,
+        vector_size=NODE2VEC_DIM,
         window=WORD2VEC_WINDOW,
         min_count=WORD2VEC_MIN_COUNT,
-        batch_words=WORD2VEC_BATCH_WORDS
+        batch_words=WORD2VEC_BATCH_WORDS,
+        workers=NUM_WORKERS,
+        sg=1
     )
 
-    ids = list(graph.nodes)
     embeddings = np.array([word2vec.wv[id] for id in ids])
     return embeddings, ids
 
@@ -104,25 +113,36 @@ def generate_test_node_embeddings(
     train_text_ids: List[str] = read_obj(train_text_ids_path)
     test_text_ids: List[str] = read_obj(test_text_ids_path)
 
+    train_node_embeddings = extract_embeddings_from_index(train_node_index)
+    test_text_embeddings = extract_embeddings_from_index(test_text_index)
+
+    # Node embedding row of each training text, or -1 if the paper has no node embedding
     train_node_id_to_idx = {id: idx for idx, id in enumerate(train_node_ids)}
-    test_node_embeddings = {n: [] for n in n_vals}
+    text_to_node_idxs = np.fromiter(
+        (train_node_id_to_idx.get(id, -1) for id in train_text_ids),
+        dtype=np.int64,
+        count=len(train_text_ids)
+    )
 
-    for i, _ in enumerate(test_text_ids):
-        test_text_vector = test_text_index.reconstruct(i)
+    max_n = max(n_vals)
+    test_node_embeddings = {
+        n: np.empty((len(test_text_ids), train_node_embeddings.shape[1]), dtype=np.float32)
+        for n in n_vals
+    }
 
-        # Retrieve top-N training text neighbours (max N)
-        _, indices = train_text_index.search(np.expand_dims(test_text_vector, axis=0), max(n_vals))
-        neighbour_text_ids = [train_text_ids[j] for j in indices[0]]
+    for start in range(0, len(test_text_ids), TEST_NODE_BATCH_SIZE):
+        end = min(start + TEST_NODE_BATCH_SIZE, len(test_text_ids))
 
-        neighbour_node_embeddings = []
-        for neighbour_text_id in neighbour_text_ids:
-            node_idx = train_node_id_to_idx[neighbour_text_id]
-            neighbour_node_embeddings.append(train_node_index.reconstruct(node_idx))
+        # Retrieve top-N training text neighbours (max N) for the whole batch
+        _, indices = train_text_index.search(test_text_embeddings[start:end], max_n)
+        node_idxs = text_to_node_idxs[indices]
+        if (node_idxs < 0).any():
+            missing_ids = {train_text_ids[j] for j in indices[node_idxs < 0]}
+            raise KeyError(f"Neighbours {sorted(missing_ids)[:5]} have no node embedding.")
 
+        # Average top-N neighbour node embeddings for every N at once with prefix sums
+        prefix_sums = np.cumsum(train_node_embeddings[node_idxs], axis=1, dtype=np.float64)
         for n in n_vals:
-            # Average top-N neighbour node embeddings
-            top_n_neighbour_node_embeddings = neighbour_node_embeddings[:n]
-            avg_node_embedding = np.mean(top_n_neighbour_node_embeddings, axis=0)
-            test_node_embeddings[n].append(avg_node_embedding)
+            test_node_embeddings[n][start:end] = prefix_sums[:, n - 1] / n
 
-    return [np.array(test_node_embeddings[n]) for n in n_vals], test_text_ids
+    return [test_node_embeddings[n] for n in n_vals], test_text_ids
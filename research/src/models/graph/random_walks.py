@@ -0,0 +1,159 @@
+import multiprocessing
+import numpy as np
+from typing import Any, Dict, Iterator, List, Tuple
+from src.config.settings import NODE2VEC_WALK_CHUNK_SIZE
+
+WalkChunk = Tuple[np.ndarray, np.ndarray]
+
+
+class RandomWalkCorpus:
+    # Streams node2vec walks to gensim instead of holding every walk in memory. Walks are
+    # seeded per chunk, so each pass over the corpus (vocabulary and every epoch) is identical
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        node_ids: List[str],
+        num_walks: int,
+        walk_length: int,
+        p: float,
+        q: float,
+        num_workers: int,
+        seed: int = 0
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.node_ids = np.array(node_ids, dtype=object)
+        self.num_walks = num_walks
+        self.walk_length = walk_length
+        self.p = p
+        self.q = q
+        self.num_workers = num_workers
+        self.seed = seed
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for walks, lengths in self.iter_walk_chunks():
+            for walk, length in zip(walks, lengths):
+                yield self.node_ids[walk[:length]].tolist()
+
+    def iter_walk_chunks(self) -> Iterator[WalkChunk]:
+        num_nodes = len(self.indptr) - 1
+        tasks = [
+            (self.seed, walk_idx, start)
+            for walk_idx in range(self.num_walks)
+            for start in range(0, num_nodes, NODE2VEC_WALK_CHUNK_SIZE)
+        ]
+        worker_args = (self.indptr, self.indices, self.walk_length, self.p, self.q)
+
+        if self.num_workers <= 1:
+            init_walk_worker(*worker_args)
+            yield from map(generate_walk_chunk, tasks)
+            return
+
+        # Chunks are returned in task order, so the corpus does not depend on worker timing
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(self.num_workers, init_walk_worker, worker_args) as pool:
+            yield from pool.imap(generate_walk_chunk, tasks)
+
+
+_walk_state: Dict[str, Any] = {}
+
+
+def init_walk_worker(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    walk_length: int,
+    p: float,
+    q: float
+) -> None:
+    num_nodes = len(indptr) - 1
+    degrees = np.diff(indptr)
+    _walk_state.update({
+        "indptr": indptr,
+        "indices": indices,
+        "degrees": degrees,
+        # Sorted (source, target) keys, to test whether an edge exists with a binary search
+        "edge_keys": np.repeat(np.arange(num_nodes, dtype=np.int64), degrees) * num_nodes + indices,
+        "walk_length": walk_length,
+        "p": p,
+        "q": q
+    })
+
+
+def generate_walk_chunk(task: Tuple[int, int, int]) -> WalkChunk:
+    seed, walk_idx, start = task
+    num_nodes = len(_walk_state["indptr"]) - 1
+
+    # Start nodes are shuffled once per walk, as in the node2vec package
+    node_order = np.random.default_rng([seed, walk_idx]).permutation(num_nodes)
+    start_nodes = node_order[start:start + NODE2VEC_WALK_CHUNK_SIZE]
+    return generate_walks(start_nodes, np.random.default_rng([seed, walk_idx, start]))
+
+
+def generate_walks(start_nodes: np.ndarray, rng: np.random.Generator) -> WalkChunk:
+    degrees = _walk_state["degrees"]
+    walk_length = _walk_state["walk_length"]
+    p, q = _walk_state["p"], _walk_state["q"]
+
+    walks = np.full((len(start_nodes), walk_length), -1, dtype=np.int32)
+    walks[:, 0] = start_nodes
+    lengths = np.ones(len(start_nodes), dtype=np.int32)
+
+    # Every walk takes a step at once; walks stop early at nodes without out-edges
+    active = np.flatnonzero(degrees[start_nodes] > 0)
+    for step in range(1, walk_length):
+        if not len(active):
+            break
+
+        current_nodes = walks[active, step - 1]
+        if step == 1 or (p == 1 and q == 1):
+            next_nodes = sample_neighbours(current_nodes, rng)
+        else:
+            next_nodes = sample_biased_neighbours(walks[active, step - 2], current_nodes, rng)
+
+        walks[active, step] = next_nodes
+        lengths[active] += 1
+        active = active[degrees[next_nodes] > 0]
+
+    return walks, lengths
+
+
+def sample_neighbours(nodes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    offsets = (rng.random(len(nodes)) * _walk_state["degrees"][nodes]).astype(np.int64)
+    return _walk_state["indices"][_walk_state["indptr"][nodes] + offsets]
+
+
+def sample_biased_neighbours(
+    previous_nodes: np.ndarray,
+    current_nodes: np.ndarray,
+    rng: np.random.Generator
+) -> np.ndarray:
+    # Rejection sampling: propose a uniform neighbour and accept it with probability
+    # proportional to its node2vec weight (1/p back, 1 to a neighbour of the previous node,
+    # 1/q further away). This needs no per-edge probability tables
+    p, q = _walk_state["p"], _walk_state["q"]
+    max_weight = max(1 / p, 1, 1 / q)
+
+    next_nodes = np.empty_like(current_nodes)
+    pending = np.arange(len(current_nodes))
+    while len(pending):
+        candidates = sample_neighbours(current_nodes[pending], rng)
+        weights = np.where(
+            has_edges(previous_nodes[pending], candidates),
+            1.0,
+            1 / q
+        )
+        weights[candidates == previous_nodes[pending]] = 1 / p
+
+        accepted = rng.random(len(pending)) * max_weight < weights
+        next_nodes[pending[accepted]] = candidates[accepted]
+        pending = pending[~accepted]
+
+    return next_nodes
+
+
+def has_edges(sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    edge_keys = _walk_state["edge_keys"]
+    keys = sources.astype(np.int64) * (len(_walk_state["indptr"]) - 1) + targets
+    positions = np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)
+    return edge_keys[positions] == keys
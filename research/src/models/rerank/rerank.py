@@ -1,24 +1,106 @@
-import networkx as nx
-from typing import Callable, Dict
-from src.utils.file_utils import read_obj, save_obj
-from src.config.settings import PAGERANK_ALPHA, HITS_MAX_ITER, HITS_TOLERANCE
+import os
+import numpy as np
+from typing import Callable, Dict, Optional
+from src.data_models.citation_graph import CitationGraph
+from src.utils.file_utils import read_graph, read_obj, save_obj
+from src.config.settings import (
+    PAGERANK_ALPHA,
+    PAGERANK_MAX_ITER,
+    PAGERANK_TOLERANCE,
+    HITS_MAX_ITER,
+    HITS_TOLERANCE
+)
+
+Scores = Dict[str, float]
 
 
 def compute_and_save_rerank_scores(
     rerank_scores_path: str,
     graph_path: str,
-    rerank_func: Callable[[nx.DiGraph], Dict[str, float]]
+    rerank_func: Callable[[CitationGraph, Optional[Scores]], Scores],
+    warm_start: bool = False
 ) -> None:
-    graph: nx.DiGraph = read_obj(graph_path)
-    scores = rerank_func(graph)
+    graph = read_graph(graph_path)
+
+    # Start from the previously saved scores, which converges faster on a slightly changed graph
+    initial_scores = None
+    if warm_start and os.path.exists(rerank_scores_path):
+        initial_scores = read_obj(rerank_scores_path)
+
+    scores = rerank_func(graph, initial_scores)
     print(f"Saving {len(scores)} scores")
     save_obj(rerank_scores_path, scores)
 
 
-def compute_pagerank_scores(graph: nx.DiGraph) -> Dict[str, float]:
-    return nx.pagerank(graph, alpha=PAGERANK_ALPHA)
+def compute_pagerank_scores(
+    graph: CitationGraph,
+    initial_scores: Optional[Scores] = None
+) -> Scores:
+    num_nodes = graph.num_nodes
+    out_degrees = np.diff(graph.out_adjacency.indptr)
+    is_dangling = out_degrees == 0
+    inverse_out_degrees = np.divide(1.0, out_degrees, out=np.zeros(num_nodes), where=~is_dangling)
+
+    scores = get_initial_vector(graph, initial_scores)
+    error = np.inf
+    for iteration in range(1, PAGERANK_MAX_ITER + 1):
+        last_scores = scores
+        # Each node passes its score evenly along its citations, and dangling nodes (citing
+        # nothing in the graph) spread theirs over every node, as in networkx
+        scores = graph.in_adjacency @ (last_scores * inverse_out_degrees)
+        scores += last_scores[is_dangling].sum() / num_nodes
+        scores = PAGERANK_ALPHA * scores + (1 - PAGERANK_ALPHA) / num_nodes
+
+        error = np.abs(scores - last_scores).sum()
+        if error < num_nodes * PAGERANK_TOLERANCE:
+            break
+
+    log_convergence("PageRank", iteration, error, num_nodes * PAGERANK_TOLERANCE)
+    return dict(zip(graph.node_ids.tolist(), scores.tolist()))
+
+
+def compute_hits_scores(
+    graph: CitationGraph,
+    initial_scores: Optional[Scores] = None
+) -> Scores:
+    authority_scores = get_initial_vector(graph, initial_scores)
+    error = np.inf
+    for iteration in range(1, HITS_MAX_ITER + 1):
+        last_authority_scores = authority_scores
+        # Hubs cite good authorities and authorities are cited by good hubs
+        hub_scores = graph.out_adjacency @ last_authority_scores
+        authority_scores = graph.in_adjacency @ hub_scores
+
+        total = authority_scores.sum()
+        if total == 0:
+            break
+        authority_scores /= total
+
+        error = np.abs(authority_scores - last_authority_scores).sum()
+        if error < HITS_TOLERANCE:
+            break
+
+    log_convergence("HITS", iteration, error, HITS_TOLERANCE)
+    return dict(zip(graph.node_ids.tolist(), authority_scores.tolist()))
+
+
+def get_initial_vector(graph: CitationGraph, initial_scores: Optional[Scores]) -> np.ndarray:
+    uniform = np.full(graph.num_nodes, 1.0 / graph.num_nodes)
+    if not initial_scores:
+        return uniform
+
+    # Nodes missing from the previous scores start at zero, and a start vector with no
+    # score left on this graph falls back to uniform
+    vector = np.array([initial_scores.get(id, 0.0) for id in graph.node_ids.tolist()])
+    total = vector.sum()
+    return vector / total if total > 0 else uniform
 
 
-def compute_hits_scores(graph: nx.DiGraph) -> Dict[str, float]:
-    _, authority_scores = nx.hits(graph, max_iter=HITS_MAX_ITER, tol=HITS_TOLERANCE)
-    return authority_scores
+def log_convergence(name: str, iteration: int, error: float, tolerance: float) -> None:
+    if error < tolerance:
+        print(f"{name} converged after {iteration} iterations (error {error:.2e})")
+    else:
+        print(
+            f"{name} did not converge after {iteration} iterations " +
+            f"(error {error:.2e}, tolerance {tolerance:.2e})"
+        )
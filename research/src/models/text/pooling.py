@@ -0,0 +1,23 @@
+import torch
+
+MEAN_POOLING = "mean"
+CLS_POOLING = "cls"
+
+
+def pool(
+    last_hidden_state: torch.Tensor,
+    attention_mask: torch.Tensor,
+    strategy: str
+) -> torch.Tensor:
+    # Must match app/backend/src/services/pooling.py so served queries land near indexed papers
+    if strategy == MEAN_POOLING:
+        return masked_mean(last_hidden_state, attention_mask)
+    if strategy == CLS_POOLING:
+        return last_hidden_state[:, 0]
+    raise ValueError(f"Unknown pooling strategy: {strategy}")
+
+
+def masked_mean(last_hidden_state: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    # Average token embeddings, ignoring the padding added to shorter texts in the batch
+    mask = attention_mask.unsqueeze(-1).to(last_hidden_state.dtype)
+    return (last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
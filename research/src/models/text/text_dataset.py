@@ -1,6 +1,7 @@
-from torch.utils.data import Dataset
+import torch
+from torch.utils.data import Dataset, Sampler
 from transformers import PreTrainedTokenizer
-from typing import List
+from typing import Dict, Iterator, List, Union
 from src.config.settings import BERT_MAX_TOKENS
 
 
@@ -28,15 +29,47 @@ class TextDataset(Dataset):
         text = f"{title} {abstract}"
         id = self.ids[idx]
 
+        # Padding is deferred to collate so each batch is only padded to its longest text
         encoding = self.tokenizer(
             text,
             add_special_tokens=True,
             max_length=self.max_len,
             truncation=True,
-            padding="max_length",
-            return_attention_mask=True,
-            return_tensors="pt"
+            return_attention_mask=True
         )
 
         encoding["id"] = id
+        encoding["idx"] = idx
         return encoding
+
+    def get_text_lengths(self) -> List[int]:
+        # Character lengths are a cheap proxy for token lengths when bucketing
+        return [len(title) + len(abstract) for title, abstract in zip(self.titles, self.abstracts)]
+
+    def collate(self, batch: List[dict]) -> Dict[str, Union[torch.Tensor, List]]:
+        encodings = self.tokenizer.pad(
+            [
+                {"input_ids": item["input_ids"], "attention_mask": item["attention_mask"]}
+                for item in batch
+            ],
+            padding=True,
+            return_tensors="pt"
+        )
+        encodings["id"] = [item["id"] for item in batch]
+        encodings["idx"] = torch.tensor([item["idx"] for item in batch])
+        return encodings
+
+
+class LengthBucketSampler(Sampler):
+    def __init__(self, lengths: List[int], batch_size: int):
+        self.lengths = lengths
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[List[int]]:
+        # Batch papers of similar length together, longest first so memory peaks early
+        order = sorted(range(len(self.lengths)), key=lambda idx: -self.lengths[idx])
+        for start in range(0, len(order), self.batch_size):
+            yield order[start:start + self.batch_size]
+
+    def __len__(self) -> int:
+        return (len(self.lengths) + self.batch_size - 1) // self.batch_size
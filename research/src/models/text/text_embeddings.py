@@ -1,17 +1,32 @@
+import multiprocessing
+import os
 import torch
 import numpy as np
 from adapters import AutoAdapterModel
-from transformers import AutoModel, AutoTokenizer
+from transformers import AutoModel, AutoTokenizer, PreTrainedTokenizer
 from torch.utils.data import DataLoader
 from tqdm import tqdm
 from gensim.models.doc2vec import Doc2Vec, TaggedDocument
 from gensim.utils import simple_preprocess
-from typing import Union, Dict, Tuple, List
-from src.models.text.text_dataset import TextDataset
+from typing import Any, Union, Dict, Tuple, List
+from src.models.text.text_dataset import TextDataset, LengthBucketSampler
+from src.models.text.pooling import pool
 from src.data_models.paper import Paper
-from src.utils.file_utils import read_papers, save_embeddings, save_obj
+from src.utils.file_utils import read_papers, save_embeddings, save_sharded_embeddings, save_obj
+from src.utils.preprocess_utils import hash_ids
+from src.utils.shard_utils import (
+    get_shard_dir,
+    get_shard_ranges,
+    load_manifest,
+    get_completed_ranges,
+    save_shard,
+    read_shards
+)
 from src.config.settings import (
     TEXT_EMBEDDING_BATCH_SIZE,
+    TEXT_POOLING,
+    EMBEDDING_SHARD_SIZE,
+    EMBEDDING_NUM_PROCESSES,
     NUM_WORKERS,
     DOC2VEC_DIM,
     DOC2VEC_WINDOW,
@@ -24,8 +39,139 @@ def generate_and_save_transformer_embeddings(
     ids_path: str,
     papers_path: str,
     model_name: str,
-    adapter_config: Union[Dict[str, str], None] = None
+    adapter_config: Union[Dict[str, str], None] = None,
+    num_processes: int = EMBEDDING_NUM_PROCESSES
+) -> None:
+    papers = read_papers(papers_path)
+    if not papers:
+        raise ValueError(f"No papers to embed in {papers_path}.")
+
+    # Embeddings are checkpointed in shards next to the index, so a rerun resumes where it stopped
+    shard_dir = get_shard_dir(index_path)
+    manifest = load_manifest(shard_dir, {
+        "papers_path": os.path.abspath(papers_path),
+        "num_papers": len(papers),
+        "ids_hash": hash_ids([paper.id for paper in papers]),
+        "model_name": model_name,
+        "adapter_config": adapter_config,
+        "pooling": TEXT_POOLING,
+        "shard_size": EMBEDDING_SHARD_SIZE
+    })
+    completed_ranges = get_completed_ranges(manifest)
+    pending_ranges = [
+        shard_range
+        for shard_range in get_shard_ranges(len(papers), EMBEDDING_SHARD_SIZE)
+        if shard_range not in completed_ranges
+    ]
+    print(f"{len(completed_ranges)} shards already completed, {len(pending_ranges)} remaining")
+
+    if pending_ranges and num_processes > 1:
+        generate_shards_in_processes(
+            shard_dir, manifest, papers, pending_ranges, model_name, adapter_config, num_processes
+        )
+    elif pending_ranges:
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        model = load_transformer_model(model_name, adapter_config).to(device)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+        for start, end in pending_ranges:
+            data_loader = create_data_loader(papers[start:end], tokenizer)
+            embeddings, _ = generate_transformer_embeddings(model, data_loader, device)
+            save_shard(shard_dir, manifest, start, end, embeddings)
+            print(f"Saved shard of papers {start}-{end}")
+
+    shards = read_shards(shard_dir, manifest)
+    print(f"Saving {len(papers)} embeddings of dim {shards[0].shape[1]}")
+    save_sharded_embeddings(index_path, shards)
+    save_obj(ids_path, [paper.id for paper in papers])
+
+
+def generate_shards_in_processes(
+    shard_dir: str,
+    manifest: Dict[str, Any],
+    papers: List[Paper],
+    shard_ranges: List[Tuple[int, int]],
+    model_name: str,
+    adapter_config: Union[Dict[str, str], None],
+    num_processes: int
+) -> None:
+    # Each process gets its own model copy and an equal share of the cores, so intra-op
+    # threads of different models do not compete for the same cores
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    num_threads = max(1, (len(cores) or os.cpu_count() or 1) // num_processes)
+    print(f"Embedding with {num_processes} processes of {num_threads} threads each")
+
+    context = multiprocessing.get_context("spawn")
+    worker_ids = context.Queue()
+    for worker_id in range(num_processes):
+        worker_ids.put(worker_id)
+
+    # Shards are split into one part per process, so a single remaining shard still
+    # keeps every process busy
+    tasks = []
+    parts: Dict[int, Dict[int, np.ndarray]] = {}
+    for start, end in shard_ranges:
+        part_size = -(-(end - start) // num_processes)
+        for part_start, part_end in get_shard_ranges(end - start, part_size):
+            tasks.append((start, start + part_start, papers[start + part_start:start + part_end]))
+        parts[start] = {}
+    shard_ends = dict(shard_ranges)
+
+    with context.Pool(
+        num_processes,
+        initializer=init_embedding_worker,
+        initargs=(model_name, adapter_config, worker_ids, cores, num_threads)
+    ) as pool:
+        for start, part_start, embeddings in pool.imap_unordered(embed_papers, tasks):
+            parts[start][part_start] = embeddings
+            end = shard_ends[start]
+            if sum(len(part) for part in parts[start].values()) < end - start:
+                continue
+
+            # Only the parent writes shards and the manifest, once all parts of a shard are done
+            shard_parts = parts.pop(start)
+            embeddings = np.concatenate([shard_parts[key] for key in sorted(shard_parts)])
+            save_shard(shard_dir, manifest, start, end, embeddings)
+            print(f"Saved shard of papers {start}-{end}")
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def init_embedding_worker(
+    model_name: str,
+    adapter_config: Union[Dict[str, str], None],
+    worker_ids: multiprocessing.Queue,
+    cores: List[int],
+    num_threads: int
 ) -> None:
+    worker_id = worker_ids.get()
+    worker_cores = cores[worker_id * num_threads:(worker_id + 1) * num_threads]
+    if worker_cores:
+        os.sched_setaffinity(0, worker_cores)
+    torch.set_num_threads(num_threads)
+
+    _worker_state["model"] = load_transformer_model(model_name, adapter_config)
+    _worker_state["tokenizer"] = AutoTokenizer.from_pretrained(model_name)
+
+
+def embed_papers(task: Tuple[int, int, List[Paper]]) -> Tuple[int, int, np.ndarray]:
+    start, part_start, papers = task
+    # Pool workers are daemonic and cannot start DataLoader workers, so tokenize in-process
+    data_loader = create_data_loader(papers, _worker_state["tokenizer"], num_workers=0)
+    embeddings, _ = generate_transformer_embeddings(
+        _worker_state["model"],
+        data_loader,
+        torch.device("cpu"),
+        show_progress=False
+    )
+    return start, part_start, embeddings
+
+
+def load_transformer_model(
+    model_name: str,
+    adapter_config: Union[Dict[str, str], None] = None
+) -> torch.nn.Module:
     if adapter_config:
         model = AutoAdapterModel.from_pretrained(model_name)
         model.load_adapter(
@@ -34,14 +180,15 @@ def generate_and_save_transformer_embeddings(
             load_as=adapter_config.get("load_as"),
             set_active=True
         )
-    else:
-        model = AutoModel.from_pretrained(model_name)
+        return model
+    return AutoModel.from_pretrained(model_name)
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = model.to(device)
 
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    papers = read_papers(papers_path)
+def create_data_loader(
+    papers: List[Paper],
+    tokenizer: PreTrainedTokenizer,
+    num_workers: int = NUM_WORKERS
+) -> DataLoader:
     dataset = TextDataset(
         [paper.title for paper in papers],
         [paper.abstract for paper in papers],
@@ -49,45 +196,44 @@ def generate_and_save_transformer_embeddings(
         tokenizer
     )
 
-    data_loader = DataLoader(
+    return DataLoader(
         dataset,
-        batch_size=TEXT_EMBEDDING_BATCH_SIZE,
-        shuffle=False,
-        num_workers=NUM_WORKERS,
-        pin_memory=True
+        batch_sampler=LengthBucketSampler(dataset.get_text_lengths(), TEXT_EMBEDDING_BATCH_SIZE),
+        collate_fn=dataset.collate,
+        num_workers=num_workers,
+        pin_memory=torch.cuda.is_available()
     )
 
-    embeddings, ids = generate_transformer_embeddings(model, data_loader, device)
-    print(f"Saving {len(embeddings)} embeddings of dim {embeddings.shape[1]}")
-    save_embeddings(index_path, embeddings)
-    save_obj(ids_path, ids)
-
 
 def generate_transformer_embeddings(
     model: torch.nn.Module,
     data_loader: DataLoader,
-    device: torch.device
+    device: torch.device,
+    pooling: str = TEXT_POOLING,
+    show_progress: bool = True
 ) -> Tuple[np.ndarray, List[str]]:
     embeddings = []
     ids = []
+    idxs = []
     model.eval()
 
     with torch.no_grad():
-        for batch in tqdm(data_loader, desc="Generating embeddings"):
-            input_ids = batch["input_ids"].squeeze(1).to(device)
-            attention_mask = batch["attention_mask"].squeeze(1).to(device)
+        for batch in tqdm(data_loader, desc="Generating embeddings", disable=not show_progress):
+            input_ids = batch["input_ids"].to(device)
+            attention_mask = batch["attention_mask"].to(device)
 
             # Forward pass
             outputs = model(input_ids, attention_mask=attention_mask)
 
-            # Average token embeddings
-            last_hidden_state = outputs.last_hidden_state
-            batch_embeddings = last_hidden_state.mean(dim=1)
+            batch_embeddings = pool(outputs.last_hidden_state, attention_mask, pooling)
             embeddings.append(batch_embeddings.cpu())
 
             ids.extend(batch["id"])
+            idxs.append(batch["idx"])
 
-    return torch.cat(embeddings, dim=0).numpy(), ids
+    # Batches are grouped by length, so restore the dataset order
+    order = torch.argsort(torch.cat(idxs)).numpy()
+    return torch.cat(embeddings, dim=0).numpy()[order], [ids[i] for i in order]
 
 
 def train_doc2vec(doc2vec_path: str, papers_path: str) -> None:
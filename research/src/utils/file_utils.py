@@ -1,11 +1,17 @@
 import os
 import json
+import struct
+import zipfile
 import faiss
 import numpy as np
 import pickle
 import pandas as pd
+import scipy.sparse as sp
 from typing import List, Dict, Any
 from src.data_models.paper import Paper
+from src.data_models.citation_graph import CitationGraph
+from src.utils.index_utils import build_index, build_index_from_shards
+from src.config.settings import FLAT_INDEX
 
 
 def combine_json_files(input_json_paths: List[str], combined_json_path: str) -> None:
@@ -55,19 +61,111 @@ def read_papers(papers_path: str) -> List[Paper]:
     return papers
 
 
-def save_embeddings(index_path: str, embeddings: np.ndarray) -> None:
+def save_embeddings(
+    index_path: str,
+    embeddings: np.ndarray,
+    index_type: str = FLAT_INDEX
+) -> None:
     os.makedirs(os.path.dirname(index_path), exist_ok=True)
     embeddings = embeddings.astype(np.float32)
 
     # Normalize embeddings for cosine similarity and store in a FAISS index with inner product
     faiss.normalize_L2(embeddings)
-    index = faiss.IndexFlatIP(embeddings.shape[1])
-    index.add(embeddings)
+    index = build_index(embeddings, index_type)
     faiss.write_index(index, index_path)
 
 
-def read_embeddings(index_path: str) -> faiss.Index:
-    return faiss.read_index(index_path)
+def save_sharded_embeddings(
+    index_path: str,
+    shards: List[np.ndarray],
+    index_type: str = FLAT_INDEX
+) -> None:
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    index = build_index_from_shards(shards, index_type)
+    faiss.write_index(index, index_path)
+
+
+def read_embeddings(index_path: str, mmap: bool = False) -> faiss.Index:
+    if not mmap:
+        return faiss.read_index(index_path)
+
+    # IVF indexes can memory-map their inverted lists, other indexes their flat vector storage
+    with open(index_path, "rb") as file:
+        fourcc = file.read(4)
+    io_flags = faiss.IO_FLAG_MMAP if fourcc.startswith(b"Iw") else faiss.IO_FLAG_MMAP_IFC
+    return faiss.read_index(index_path, io_flags | faiss.IO_FLAG_READ_ONLY)
+
+
+def save_graph(graph_path: str, graph: CitationGraph) -> None:
+    os.makedirs(os.path.dirname(graph_path), exist_ok=True)
+    # Stored uncompressed, so the arrays can be memory-mapped straight from the archive
+    np.savez(
+        graph_path,
+        node_ids=np.asarray(graph.node_ids, dtype=str),
+        out_indptr=graph.out_adjacency.indptr,
+        out_indices=graph.out_adjacency.indices,
+        in_indptr=graph.in_adjacency.indptr,
+        in_indices=graph.in_adjacency.indices
+    )
+
+
+def read_graph(graph_path: str, mmap: bool = True) -> CitationGraph:
+    arrays = read_npz(graph_path, mmap)
+    num_nodes = len(arrays["node_ids"])
+    # Every edge has weight 1, so the data array is shared by both adjacency matrices
+    data = np.ones(len(arrays["out_indices"]), dtype=np.int8)
+
+    return CitationGraph(
+        node_ids=arrays["node_ids"],
+        out_adjacency=sp.csr_matrix(
+            (data, arrays["out_indices"], arrays["out_indptr"]),
+            shape=(num_nodes, num_nodes)
+        ),
+        in_adjacency=sp.csr_matrix(
+            (data, arrays["in_indices"], arrays["in_indptr"]),
+            shape=(num_nodes, num_nodes)
+        )
+    )
+
+
+def read_npz(npz_path: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    if not mmap:
+        with np.load(npz_path) as npz:
+            return {name: npz[name] for name in npz.files}
+
+    # np.load ignores mmap_mode for .npz archives, so map each stored member directly
+    arrays = {}
+    with zipfile.ZipFile(npz_path) as archive, open(npz_path, "rb") as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Cannot memory-map compressed member {info.filename}.")
+
+            # The local file header precedes each member's data
+            file.seek(info.header_offset)
+            local_header = file.read(30)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            name = os.path.splitext(info.filename)[0]
+            if not np.prod(shape):
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+
+            arrays[name] = np.memmap(
+                npz_path,
+                dtype=dtype,
+                mode='r',
+                offset=file.tell(),
+                shape=shape,
+                order='F' if fortran_order else 'C'
+            )
+    return arrays
 
 
 def save_obj(path: str, obj: Any) -> None:
@@ -0,0 +1,112 @@
+import faiss
+import numpy as np
+from typing import List
+from src.config.settings import (
+    FLAT_INDEX,
+    IVF_FLAT_INDEX,
+    IVF_PQ_INDEX,
+    HNSW_INDEX,
+    FAISS_IVF_NLIST,
+    FAISS_IVF_MIN_POINTS_PER_CENTROID,
+    FAISS_PQ_M,
+    FAISS_PQ_NBITS,
+    FAISS_HNSW_M,
+    FAISS_HNSW_EF_CONSTRUCTION,
+    FAISS_MAX_TRAIN_POINTS,
+    FAISS_ADD_BATCH_SIZE
+)
+
+
+def build_index(embeddings: np.ndarray, index_type: str = FLAT_INDEX) -> faiss.Index:
+    # Expects float32 L2-normalized embeddings, searched with inner product (cosine similarity)
+    index = create_index(embeddings.shape[1], len(embeddings), index_type)
+
+    if not index.is_trained:
+        index.train(embeddings)
+    index.add(embeddings)
+
+    enable_reconstruction(index)
+    return index
+
+
+def build_index_from_shards(shards: List[np.ndarray], index_type: str = FLAT_INDEX) -> faiss.Index:
+    # Shards hold raw embeddings and may be memory-mapped, so they are normalized chunk by chunk
+    num_embeddings = sum(len(shard) for shard in shards)
+    index = create_index(shards[0].shape[1], num_embeddings, index_type)
+
+    if not index.is_trained:
+        index.train(sample_normalized_rows(shards, FAISS_MAX_TRAIN_POINTS))
+
+    for shard in shards:
+        for start in range(0, len(shard), FAISS_ADD_BATCH_SIZE):
+            chunk = np.array(shard[start:start + FAISS_ADD_BATCH_SIZE], dtype=np.float32)
+            faiss.normalize_L2(chunk)
+            index.add(chunk)
+
+    enable_reconstruction(index)
+    return index
+
+
+def create_index(dim: int, num_embeddings: int, index_type: str) -> faiss.Index:
+    index = faiss.index_factory(
+        dim,
+        get_index_description(index_type, num_embeddings),
+        faiss.METRIC_INNER_PRODUCT
+    )
+
+    if index_type == HNSW_INDEX:
+        index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+    return index
+
+
+def enable_reconstruction(index: faiss.Index) -> None:
+    # Keep vectors reconstructable by position, as with the flat index
+    ivf_index = faiss.try_extract_index_ivf(index)
+    if ivf_index is not None:
+        ivf_index.make_direct_map()
+
+
+def sample_normalized_rows(shards: List[np.ndarray], max_rows: int) -> np.ndarray:
+    num_rows = sum(len(shard) for shard in shards)
+    rows = np.arange(num_rows)
+    if num_rows > max_rows:
+        rows = np.sort(np.random.default_rng(0).choice(num_rows, max_rows, replace=False))
+
+    samples = []
+    shard_start = 0
+    for shard in shards:
+        shard_rows = rows[(rows >= shard_start) & (rows < shard_start + len(shard))]
+        samples.append(np.array(shard[shard_rows - shard_start], dtype=np.float32))
+        shard_start += len(shard)
+
+    sample = np.vstack(samples)
+    faiss.normalize_L2(sample)
+    return sample
+
+
+def get_index_description(index_type: str, num_embeddings: int) -> str:
+    if index_type == FLAT_INDEX:
+        return "Flat"
+    if index_type == HNSW_INDEX:
+        return f"HNSW{FAISS_HNSW_M},Flat"
+
+    # Avoid training more centroids than the embeddings can support
+    nlist = max(1, min(FAISS_IVF_NLIST, num_embeddings // FAISS_IVF_MIN_POINTS_PER_CENTROID))
+    if index_type == IVF_FLAT_INDEX:
+        return f"IVF{nlist},Flat"
+    if index_type == IVF_PQ_INDEX:
+        return f"IVF{nlist},PQ{FAISS_PQ_M}x{FAISS_PQ_NBITS}"
+
+    raise ValueError(
+        f"Unsupported index type: {index_type}. Expected '{FLAT_INDEX}', '{IVF_FLAT_INDEX}', " +
+        f"'{IVF_PQ_INDEX}' or '{HNSW_INDEX}'."
+    )
+
+
+def set_search_parameters(index: faiss.Index, nprobe: int, ef_search: int) -> None:
+    parameter_space = faiss.ParameterSpace()
+
+    if faiss.try_extract_index_ivf(index) is not None:
+        parameter_space.set_index_parameter(index, "nprobe", nprobe)
+    elif isinstance(faiss.downcast_index(index), faiss.IndexHNSW):
+        parameter_space.set_index_parameter(index, "efSearch", ef_search)
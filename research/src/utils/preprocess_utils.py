@@ -1,7 +1,10 @@
+import hashlib
+import os
 import faiss
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from src.data_models.paper import Paper
+from src.config.settings import FAISS_RECONSTRUCT_BATCH_SIZE
 
 
 def remove_missing_references(papers: List[Paper]) -> None:
@@ -22,22 +25,104 @@ def compute_citation_counts(papers: List[Paper]) -> None:
 
 
 def extract_embeddings_from_index(index: faiss.Index) -> np.ndarray:
-    embeddings = np.zeros((index.ntotal, index.d), dtype=np.float32)
-    for i in range(index.ntotal):
-        index.reconstruct(i, embeddings[i])
+    flat_index = faiss.downcast_index(index)
+    if isinstance(flat_index, faiss.IndexFlat):
+        # Flat indexes store the raw float32 vectors, so expose their buffer without copying.
+        # The view is read-only, as the buffer may be a memory-mapped index file
+        buffer = faiss.rev_swig_ptr(flat_index.get_xb(), index.ntotal * index.d)
+        embeddings = np.asarray(IndexBuffer(index, buffer)).reshape(index.ntotal, index.d)
+        embeddings.flags.writeable = False
+        return embeddings
+
+    # Other index types decode their codes, a chunk at a time to bound temporary memory
+    embeddings = np.empty((index.ntotal, index.d), dtype=np.float32)
+    for start in range(0, index.ntotal, FAISS_RECONSTRUCT_BATCH_SIZE):
+        num_rows = min(FAISS_RECONSTRUCT_BATCH_SIZE, index.ntotal - start)
+        embeddings[start:start + num_rows] = index.reconstruct_n(start, num_rows)
     return embeddings
 
 
+class IndexBuffer:
+    # Keeps the index alive for as long as a NumPy view of its buffer exists
+    def __init__(self, index: faiss.Index, buffer: np.ndarray):
+        self.index = index
+        self.__array_interface__ = buffer.__array_interface__
+
+
 def align_embeddings(
     aligned_ids: List[str],
     to_align_embeddings: np.ndarray,
-    to_align_ids: List[str]
+    to_align_ids: List[str],
+    cache_path: Optional[str] = None
 ) -> Tuple[np.ndarray, List[str]]:
-    if sorted(aligned_ids) != sorted(to_align_ids):
-        raise ValueError("IDs in 'aligned_ids' and 'to_align_ids' do not match.")
+    permutation = get_alignment(aligned_ids, to_align_ids, cache_path)
 
-    to_align_id_to_idx = {to_align_ids[i]: i for i in range(len(to_align_ids))}
-    aligned_embeddings = np.array(
-        [to_align_embeddings[to_align_id_to_idx[id]] for id in aligned_ids]
+    aligned_embeddings = np.empty(
+        (len(permutation), to_align_embeddings.shape[1]),
+        dtype=to_align_embeddings.dtype
     )
+    np.take(to_align_embeddings, permutation, axis=0, out=aligned_embeddings)
     return aligned_embeddings, aligned_ids
+
+
+def get_alignment(
+    aligned_ids: List[str],
+    to_align_ids: List[str],
+    cache_path: Optional[str] = None
+) -> np.ndarray:
+    # The cache is keyed by both ID lists, so it is recomputed whenever either changes
+    fingerprint = hash_ids(aligned_ids) + hash_ids(to_align_ids)
+    if cache_path and os.path.exists(cache_path):
+        cache = np.load(cache_path)
+        if str(cache["fingerprint"]) == fingerprint:
+            return cache["permutation"]
+
+    permutation = compute_alignment(aligned_ids, to_align_ids)
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        np.savez(cache_path, permutation=permutation, fingerprint=fingerprint)
+    return permutation
+
+
+def get_alignment_cache_path(aligned_ids_path: str, to_align_ids_path: str) -> str:
+    aligned_name = os.path.splitext(os.path.basename(aligned_ids_path))[0]
+    return f"{os.path.splitext(to_align_ids_path)[0]}_to_{aligned_name}.npz"
+
+
+def compute_alignment(aligned_ids: List[str], to_align_ids: List[str]) -> np.ndarray:
+    # Row of 'to_align_ids' holding each ID of 'aligned_ids', or -1 if it is missing
+    to_align_id_to_idx = {id: i for i, id in enumerate(to_align_ids)}
+    permutation = np.fromiter(
+        (to_align_id_to_idx.get(id, -1) for id in aligned_ids),
+        dtype=np.int64,
+        count=len(aligned_ids)
+    )
+
+    found = permutation >= 0
+    use_counts = np.bincount(permutation[found], minlength=len(to_align_ids))
+    errors = []
+    if len(to_align_id_to_idx) < len(to_align_ids):
+        # Only the last row of a repeated ID is indexed, so the others are not reported as unused
+        repeated_rows = [i for i, id in enumerate(to_align_ids) if to_align_id_to_idx[id] != i]
+        use_counts[repeated_rows] = 1
+        repeated = [to_align_ids[i] for i in repeated_rows]
+        errors.append(f"{len(repeated)} duplicate 'to_align_ids' {repeated[:5]}")
+    if not found.all():
+        missing = [aligned_ids[i] for i in np.flatnonzero(~found)]
+        errors.append(f"{len(missing)} 'aligned_ids' not in 'to_align_ids' {missing[:5]}")
+    if (use_counts > 1).any():
+        duplicates = [to_align_ids[i] for i in np.flatnonzero(use_counts > 1)]
+        errors.append(f"{len(duplicates)} duplicate 'aligned_ids' {duplicates[:5]}")
+    if (use_counts == 0).any():
+        extra = [to_align_ids[i] for i in np.flatnonzero(use_counts == 0)]
+        errors.append(f"{len(extra)} 'to_align_ids' not in 'aligned_ids' {extra[:5]}")
+
+    if errors:
+        raise ValueError(
+            f"IDs in 'aligned_ids' and 'to_align_ids' do not match: {'; '.join(errors)}."
+        )
+    return permutation
+
+
+def hash_ids(ids: List[str]) -> str:
+    return hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()
@@ -0,0 +1,85 @@
+import json
+import os
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+MANIFEST_FILE = "manifest.json"
+
+Manifest = Dict[str, Any]
+
+
+def get_shard_dir(index_path: str) -> str:
+    return f"{os.path.splitext(index_path)[0]}_shards"
+
+
+def get_shard_ranges(num_items: int, shard_size: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + shard_size, num_items))
+        for start in range(0, num_items, shard_size)
+    ]
+
+
+def load_manifest(shard_dir: str, config: Dict[str, Any]) -> Manifest:
+    manifest_path = os.path.join(shard_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {"config": config, "shards": []}
+
+    with open(manifest_path, 'r', encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    # Shards from a different run (papers, model or shard size) cannot be resumed
+    if manifest["config"] != config:
+        raise ValueError(
+            f"Shards in {shard_dir} were generated with {manifest['config']}, not {config}. " +
+            "Remove the directory to start over."
+        )
+    return manifest
+
+
+def save_manifest(shard_dir: str, manifest: Manifest) -> None:
+    os.makedirs(shard_dir, exist_ok=True)
+    manifest_path = os.path.join(shard_dir, MANIFEST_FILE)
+    with open(f"{manifest_path}.tmp", 'w', encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+
+def get_completed_ranges(manifest: Manifest) -> List[Tuple[int, int]]:
+    return [(shard["start"], shard["end"]) for shard in manifest["shards"]]
+
+
+def save_shard(
+    shard_dir: str,
+    manifest: Manifest,
+    start: int,
+    end: int,
+    embeddings: np.ndarray
+) -> None:
+    file_name = write_shard(shard_dir, start, end, embeddings)
+    record_shard(shard_dir, manifest, start, end, file_name)
+
+
+def write_shard(shard_dir: str, start: int, end: int, embeddings: np.ndarray) -> str:
+    os.makedirs(shard_dir, exist_ok=True)
+    file_name = f"shard_{start:09d}_{end:09d}.npy"
+    shard_path = os.path.join(shard_dir, file_name)
+
+    # Write then rename, so an interrupted run never leaves a truncated shard in the manifest
+    with open(f"{shard_path}.tmp", "wb") as file:
+        np.save(file, embeddings.astype(np.float32))
+    os.replace(f"{shard_path}.tmp", shard_path)
+    return file_name
+
+
+def record_shard(shard_dir: str, manifest: Manifest, start: int, end: int, file_name: str) -> None:
+    manifest["shards"].append({"start": start, "end": end, "file": file_name})
+    manifest["shards"].sort(key=lambda shard: shard["start"])
+    save_manifest(shard_dir, manifest)
+
+
+def read_shards(shard_dir: str, manifest: Manifest) -> List[np.ndarray]:
+    # Shards are memory-mapped, so merging never holds more than one chunk in memory
+    return [
+        np.load(os.path.join(shard_dir, shard["file"]), mmap_mode='r')
+        for shard in manifest["shards"]
+    ]